@@ -1,148 +1,764 @@
 """
 NeuroHoneypot - Alert System
-Console and file-based alerting for critical threats
-Can be extended with email/Slack integration
+Console, file, email and webhook alerting for critical threats
 """
+import atexit
 import json
 import os
+import queue
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, deque
 from datetime import datetime
+from itertools import islice
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from colorama import init, Fore, Back, Style
 
 # Initialize colorama for Windows color support
 init(autoreset=True)
 
+# Identical alerts (same severity, title and IP) within this many seconds
+# are collapsed into one alert plus a summary with the repeat count
+SUPPRESSION_WINDOW = 60
+SUPPRESSION_SWEEP = 5          # seconds between checks for expired suppression windows
+
+# Alert delivery channels (console, file, email, webhook)
+ALERT_CHANNELS = ['console', 'file']   # add 'email' and/or 'webhook' to fan out further
+CHANNEL_QUEUE_SIZE = 10000             # pending alerts per channel before new ones are dropped
+SMTP_HOST = 'localhost'
+SMTP_PORT = 1025
+SMTP_SENDER = 'neurohoneypot@localhost'
+SMTP_RECIPIENTS = ['soc@localhost']
+WEBHOOK_URL = 'http://localhost:5004/alerts'
+
+SEVERITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+# Console rendering under load
+CONSOLE_COMPACT_RATE = 5         # alerts per second above which output goes one-line
+CONSOLE_SUMMARY_INTERVAL = 5     # seconds between summary lines in compact mode
+CONSOLE_MAX_LINES = 20           # compact lines per interval before alerts are only counted
+
+class ConsoleRenderer:
+    """
+    Render alerts to the console with a single write per batch.
+    
+    At normal rates every alert gets the full coloured block. Above
+    CONSOLE_COMPACT_RATE alerts per second the renderer switches to one
+    line per alert, prints at most CONSOLE_MAX_LINES per interval (critical
+    alerts always print) and folds the rest into a summary line such as
+    "+1,243 suppressed high alerts in last 5s". It goes back to full blocks
+    after an interval below the rate.
+    """
+    
+    COLORS = {
+        'low': Fore.GREEN,
+        'medium': Fore.YELLOW,
+        'high': Fore.RED,
+        'critical': Fore.WHITE + Back.RED
+    }
+    
+    ICONS = {
+        'low': '📗',
+        'medium': '📙',
+        'high': '📕',
+        'critical': '🚨'
+    }
+    
+    def __init__(self, stream=None, compact_rate=CONSOLE_COMPACT_RATE,
+                 summary_interval=CONSOLE_SUMMARY_INTERVAL, max_lines=CONSOLE_MAX_LINES):
+        self.stream = stream
+        self.compact_rate = compact_rate
+        self.summary_interval = summary_interval
+        self.max_lines = max_lines
+        self.arrivals = deque(maxlen=max(int(compact_rate), 1))
+        self.compact = False
+        self.interval_start = time.monotonic()
+        self.interval_count = 0
+        self.interval_lines = 0
+        self.suppressed = {}
+    
+    def render(self, alerts):
+        """Render a batch of alerts"""
+        now = time.monotonic()
+        parts = []
+        self._roll_interval(now, parts)
+        
+        for alert_data in alerts:
+            self.arrivals.append(now)
+            self.interval_count += 1
+            if (not self.compact and len(self.arrivals) == self.arrivals.maxlen
+                    and now - self.arrivals[0] < 1.0):
+                self.compact = True
+                parts.append(f"{Fore.YELLOW}⚠️  Alert rate above {self.compact_rate}/s - "
+                             f"switching to compact output{Style.RESET_ALL}\n")
+            
+            severity = alert_data['severity']
+            if not self.compact:
+                parts.append(self.format_block(alert_data))
+            elif self.interval_lines < self.max_lines or severity == 'critical':
+                parts.append(self.format_line(alert_data))
+                self.interval_lines += 1
+            else:
+                self.suppressed[severity] = self.suppressed.get(severity, 0) + 1
+        
+        self._write(parts)
+    
+    def tick(self):
+        """Emit a pending summary once the interval is over, even without new alerts"""
+        parts = []
+        self._roll_interval(time.monotonic(), parts)
+        self._write(parts)
+    
+    def format_block(self, alert_data):
+        """Full multi-line coloured alert"""
+        severity = alert_data['severity']
+        color = self.COLORS.get(severity, Fore.WHITE)
+        icon = self.ICONS.get(severity, '📢')
+        reset = Style.RESET_ALL
+        
+        lines = [
+            f"\n{color}{icon} ALERT [{severity.upper()}] {icon}{reset}",
+            f"{color}{'='*60}{reset}",
+            f"{color}Title: {alert_data['title']}{reset}",
+            f"{color}Message: {alert_data['message']}{reset}",
+            f"{color}Time: {alert_data['timestamp']}{reset}",
+        ]
+        
+        if alert_data.get('count', 1) > 1:
+            lines.append(f"{color}Occurrences: {alert_data['count']} "
+                         f"({alert_data['first_seen']} → {alert_data['last_seen']}){reset}")
+        
+        if alert_data['details']:
+            lines.append(f"{color}Details:{reset}")
+            for key, value in alert_data['details'].items():
+                lines.append(f"{color}  • {key}: {value}{reset}")
+        
+        lines.append(f"{color}{'='*60}{reset}\n")
+        return '\n'.join(lines) + '\n'
+    
+    def format_line(self, alert_data):
+        """One-line alert for compact mode"""
+        severity = alert_data['severity']
+        color = self.COLORS.get(severity, Fore.WHITE)
+        icon = self.ICONS.get(severity, '📢')
+        ip = alert_data['details'].get('ip', '-')
+        count = f" x{alert_data['count']}" if alert_data.get('count', 1) > 1 else ''
+        return (f"{color}{icon} {alert_data['timestamp'][11:19]} [{severity.upper()}] "
+                f"{alert_data['title']} ({ip}){count}{Style.RESET_ALL}\n")
+    
+    def _roll_interval(self, now, parts):
+        elapsed = now - self.interval_start
+        if elapsed < self.summary_interval:
+            return
+        
+        for severity, count in self.suppressed.items():
+            color = self.COLORS.get(severity, Fore.WHITE)
+            parts.append(f"{color}+{count:,} suppressed {severity} alerts in last "
+                         f"{elapsed:.0f}s{Style.RESET_ALL}\n")
+        
+        if self.compact and self.interval_count / elapsed < self.compact_rate:
+            self.compact = False
+            parts.append(f"{Fore.GREEN}✅ Alert rate back to normal - full output resumed{Style.RESET_ALL}\n")
+        
+        self.interval_start = now
+        self.interval_count = 0
+        self.interval_lines = 0
+        self.suppressed = {}
+    
+    def _write(self, parts):
+        if parts:
+            stream = self.stream or sys.stdout
+            stream.write(''.join(parts))
+            stream.flush()
+
+class AlertChannel:
+    """
+    Base class for alert delivery channels.
+    
+    deliver() receives a batch of up to batch_size alerts collected for at
+    most batch_wait seconds. Failed deliveries are retried with exponential
+    backoff, and rate_limit caps deliveries per minute (None = unlimited).
+    Lossless channels make the caller wait when their queue is full instead
+    of dropping the alert.
+    """
+    
+    name = 'channel'
+    lossless = False
+    tick_interval = None
+    
+    def __init__(self, batch_size=1, batch_wait=0.0, rate_limit=None,
+                 max_retries=3, backoff=0.5, min_severity='low'):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.rate_limit = rate_limit
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.min_severity = min_severity
+    
+    def accepts(self, alert_data):
+        """Whether this channel wants the alert at all"""
+        return SEVERITY_RANK.get(alert_data['severity'], 0) >= SEVERITY_RANK.get(self.min_severity, 0)
+    
+    def deliver(self, alerts):
+        """Send a batch of alerts"""
+        raise NotImplementedError
+    
+    def tick(self):
+        """Called every tick_interval seconds while the channel is idle"""
+        pass
+
+class ConsoleChannel(AlertChannel):
+    """Render alerts to the console through a ConsoleRenderer"""
+    
+    name = 'console'
+    
+    def __init__(self, renderer=None, **kwargs):
+        kwargs.setdefault('batch_size', 200)
+        super().__init__(**kwargs)
+        self.renderer = renderer or ConsoleRenderer()
+        self.tick_interval = self.renderer.summary_interval
+    
+    def deliver(self, alerts):
+        self.renderer.render(alerts)
+    
+    def tick(self):
+        self.renderer.tick()
+
+class FileChannel(AlertChannel):
+    """Append alerts to a JSONL file, one write per batch"""
+    
+    name = 'file'
+    lossless = True
+    
+    def __init__(self, write, **kwargs):
+        kwargs.setdefault('batch_size', 500)
+        super().__init__(**kwargs)
+        self.write = write
+    
+    def deliver(self, alerts):
+        self.write(alerts)
+
+class SmtpChannel(AlertChannel):
+    """Email a digest of alerts over SMTP"""
+    
+    name = 'email'
+    
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, sender=SMTP_SENDER,
+                 recipients=None, timeout=10, **kwargs):
+        kwargs.setdefault('batch_size', 50)
+        kwargs.setdefault('batch_wait', 30.0)
+        kwargs.setdefault('rate_limit', 10)
+        kwargs.setdefault('min_severity', 'high')
+        super().__init__(**kwargs)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients or SMTP_RECIPIENTS
+        self.timeout = timeout
+    
+    def deliver(self, alerts):
+        worst = max(alerts, key=lambda a: SEVERITY_RANK.get(a['severity'], 0))
+        if len(alerts) == 1:
+            subject = f"[NeuroHoneypot {worst['severity'].upper()}] {worst['title']}"
+        else:
+            subject = f"[NeuroHoneypot {worst['severity'].upper()}] {len(alerts)} alerts"
+        
+        lines = []
+        for alert_data in alerts:
+            lines.append(f"[{alert_data['severity'].upper()}] {alert_data['title']}")
+            lines.append(f"  Time: {alert_data['timestamp']}")
+            lines.append(f"  Message: {alert_data['message']}")
+            if alert_data.get('count', 1) > 1:
+                lines.append(f"  Occurrences: {alert_data['count']}")
+            for key, value in alert_data.get('details', {}).items():
+                lines.append(f"  {key}: {value}")
+            lines.append("")
+        
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = self.sender
+        message['To'] = ', '.join(self.recipients)
+        message.set_content('\n'.join(lines))
+        
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(message)
+
+class WebhookChannel(AlertChannel):
+    """POST batches of alerts as JSON (Slack-compatible 'text' field included)"""
+    
+    name = 'webhook'
+    
+    def __init__(self, url=WEBHOOK_URL, timeout=5, **kwargs):
+        kwargs.setdefault('batch_size', 20)
+        kwargs.setdefault('batch_wait', 2.0)
+        kwargs.setdefault('rate_limit', 60)
+        kwargs.setdefault('min_severity', 'medium')
+        super().__init__(**kwargs)
+        self.url = url
+        self.timeout = timeout
+    
+    def deliver(self, alerts):
+        text = '\n'.join(
+            f"[{a['severity'].upper()}] {a['title']}: {a['message']}" for a in alerts
+        )
+        body = json.dumps({'text': text, 'alerts': alerts}).encode()
+        req = urllib.request.Request(
+            self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+class _ChannelLane:
+    """Queue, worker thread, rate limiter and metrics for one channel"""
+    
+    def __init__(self, channel, queue_size):
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.tokens = float(channel.rate_limit or 0)
+        self.last_refill = time.monotonic()
+        self.latencies = deque(maxlen=1000)
+        self.stats = {'delivered': 0, 'batches': 0, 'retries': 0, 'failed': 0, 'dropped': 0}
+        self.thread = threading.Thread(target=self._run, name=f"alerts-{channel.name}", daemon=True)
+        self.thread.start()
+    
+    def _run(self):
+        channel = self.channel
+        while True:
+            try:
+                batch = [self.queue.get(timeout=channel.tick_interval)]
+            except queue.Empty:
+                channel.tick()
+                continue
+            deadline = time.monotonic() + channel.batch_wait
+            while len(batch) < channel.batch_size and batch[-1][0] is not None:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self.queue.get(timeout=remaining) if remaining > 0
+                                 else self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            alerts = [a for queued_at, a in batch if queued_at is not None]
+            if alerts:
+                self._wait_for_token()
+                self._deliver(alerts, [queued_at for queued_at, _ in batch if queued_at is not None])
+            for queued_at, marker in batch:
+                if queued_at is None:
+                    marker.set()
+    
+    def _wait_for_token(self):
+        rate = self.channel.rate_limit
+        if not rate:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(rate, self.tokens + (now - self.last_refill) * rate / 60.0)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) * 60.0 / rate)
+    
+    def _deliver(self, alerts, queued_times):
+        channel = self.channel
+        for attempt in range(channel.max_retries + 1):
+            try:
+                channel.deliver(alerts)
+            except Exception as e:
+                if attempt == channel.max_retries:
+                    self.stats['failed'] += len(alerts)
+                    self.stats['last_error'] = f"{datetime.now().isoformat()} {e}"
+                    return
+                self.stats['retries'] += 1
+                time.sleep(channel.backoff * (2 ** attempt))
+            else:
+                break
+        
+        now = time.monotonic()
+        self.latencies.extend(now - t for t in queued_times)
+        self.stats['delivered'] += len(alerts)
+        self.stats['batches'] += 1
+
+class AlertDispatcher:
+    """
+    Fan alerts out to channels without blocking the caller.
+    
+    Each channel has its own bounded queue and worker, so a slow SMTP server
+    cannot hold up the console or the alert log. When a queue is full the
+    alert is dropped for that channel and counted, except on lossless
+    channels (the alert log), which apply backpressure instead.
+    """
+    
+    def __init__(self, channels, queue_size=CHANNEL_QUEUE_SIZE):
+        self.lanes = [_ChannelLane(channel, queue_size) for channel in channels]
+    
+    def dispatch(self, alert_data):
+        """Queue an alert on every channel that accepts it"""
+        now = time.monotonic()
+        for lane in self.lanes:
+            if lane.channel.accepts(alert_data):
+                try:
+                    lane.queue.put_nowait((now, alert_data))
+                except queue.Full:
+                    if lane.channel.lossless:
+                        lane.queue.put((now, alert_data))
+                    else:
+                        lane.stats['dropped'] += 1
+    
+    def flush(self, timeout=5, channels=None):
+        """
+        Wait until every channel (or only those named in channels) has
+        handled what was queued before the call
+        """
+        markers = []
+        for lane in self.lanes:
+            if channels is not None and lane.channel.name not in channels:
+                continue
+            marker = threading.Event()
+            lane.queue.put((None, marker))
+            markers.append(marker)
+        deadline = time.monotonic() + timeout
+        return all(m.wait(max(deadline - time.monotonic(), 0)) for m in markers)
+    
+    def get_metrics(self):
+        """Per-channel delivery counts, queue depth and latency percentiles (ms)"""
+        metrics = {}
+        for lane in self.lanes:
+            latencies = sorted(lane.latencies)
+            def pct(p):
+                if not latencies:
+                    return 0.0
+                return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 3)
+            metrics[lane.channel.name] = {
+                **lane.stats,
+                'queued': lane.queue.qsize(),
+                'latency_ms': {'p50': pct(50), 'p99': pct(99)}
+            }
+        return metrics
+
+# Alert store: in-memory recent alerts plus persistent counters
+RECENT_ALERTS = 1000           # alerts kept in memory for get_recent_alerts
+HOURLY_RETENTION = 24 * 30     # hourly counters kept (30 days)
+CHECKPOINT_EVERY = 500         # alerts written between checkpoints
+
+class AlertStore:
+    """
+    Index over the alert log.
+    
+    Keeps the most recent alerts in a ring buffer and running per-severity
+    and per-hour counters, so recent and stat queries cost O(k) instead of
+    a scan of alerts.jsonl. State is checkpointed next to the log together
+    with the file identity and byte offset it covers; on restart only the
+    bytes appended after the checkpoint are read. If the log was replaced
+    or truncated, the store is rebuilt from the whole file once.
+    """
+    
+    def __init__(self, alert_file, checkpoint_file=None, capacity=RECENT_ALERTS):
+        self.alert_file = alert_file
+        self.checkpoint_file = checkpoint_file or os.path.splitext(alert_file)[0] + '_checkpoint.json'
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=capacity)
+        self.by_severity = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+        self.by_hour = {}
+        self.offset = 0
+        self.identity = None
+        self.unsaved = 0
+        self.load()
+    
+    def load(self):
+        """Restore from the checkpoint, then index anything appended since"""
+        checkpoint = None
+        if os.path.exists(self.checkpoint_file):
+            try:
+                with open(self.checkpoint_file, 'r') as f:
+                    checkpoint = json.load(f)
+            except (OSError, ValueError):
+                checkpoint = None
+        
+        identity = self._file_identity()
+        with self.lock:
+            if (checkpoint and identity and checkpoint.get('identity') == identity[:2]
+                    and checkpoint.get('offset', 0) <= identity[2]):
+                self.recent.extend(checkpoint.get('recent', []))
+                self.by_severity.update(checkpoint.get('by_severity', {}))
+                self.by_hour = checkpoint.get('by_hour', {})
+                self.offset = checkpoint['offset']
+            self.identity = identity[:2] if identity else None
+            self._scan_tail()
+    
+    def append(self, alerts, start, end):
+        """Index alerts that were just written to bytes [start, end) of the log"""
+        with self.lock:
+            if start != self.offset:
+                # Someone else wrote to (or replaced) the log; catch up first
+                self._scan_tail(stop=start)
+            for alert_data in alerts:
+                self._index(alert_data)
+            self.offset = end
+            self.unsaved += len(alerts)
+            if self.unsaved >= CHECKPOINT_EVERY:
+                self._save()
+    
+    def get_recent(self, count=50):
+        """Last count alerts, oldest first"""
+        with self.lock:
+            count = min(count, len(self.recent))
+            return list(islice(reversed(self.recent), count))[::-1]
+    
+    def get_counts(self):
+        """Per-severity and per-hour occurrence counters"""
+        with self.lock:
+            return dict(self.by_severity), dict(self.by_hour)
+    
+    def save(self):
+        """Write a checkpoint now"""
+        with self.lock:
+            self._save()
+    
+    def clear(self):
+        """Forget everything, including the checkpoint"""
+        with self.lock:
+            self.recent.clear()
+            self.by_severity = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+            self.by_hour = {}
+            self.offset = 0
+            self.identity = None
+            self.unsaved = 0
+            if os.path.exists(self.checkpoint_file):
+                os.remove(self.checkpoint_file)
+    
+    def _file_identity(self):
+        try:
+            st = os.stat(self.alert_file)
+        except OSError:
+            return None
+        return [st.st_dev, st.st_ino, st.st_size]
+    
+    def _index(self, alert_data):
+        # Aggregated summaries stand for count occurrences, the first of
+        # which was already counted when it was sent
+        occurrences = alert_data.get('count', 1) - 1 if alert_data.get('aggregated') else 1
+        severity = alert_data.get('severity', 'low')
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + occurrences
+        hour = alert_data.get('timestamp', '')[:13]
+        if hour not in self.by_hour and len(self.by_hour) >= HOURLY_RETENTION:
+            del self.by_hour[min(self.by_hour)]
+        self.by_hour[hour] = self.by_hour.get(hour, 0) + occurrences
+        self.recent.append(alert_data)
+    
+    def _scan_tail(self, stop=None):
+        """Index log lines from self.offset up to stop (or end of file)"""
+        identity = self._file_identity()
+        if identity is None:
+            return
+        if self.identity != identity[:2] or identity[2] < self.offset:
+            # Rotated or truncated: rebuild from scratch
+            self.recent.clear()
+            self.by_severity = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+            self.by_hour = {}
+            self.offset = 0
+            self.identity = identity[:2]
+        with open(self.alert_file, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read() if stop is None else f.read(max(stop - self.offset, 0))
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                try:
+                    self._index(json.loads(line))
+                except ValueError:
+                    pass
+        self.offset += end
+    
+    def _save(self):
+        checkpoint = {
+            'identity': self.identity,
+            'offset': self.offset,
+            'by_severity': self.by_severity,
+            'by_hour': self.by_hour,
+            'recent': list(self.recent),
+            'saved_at': datetime.now().isoformat()
+        }
+        tmp_path = self.checkpoint_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_file)
+        self.unsaved = 0
+
 class AlertSystem:
     """
     Multi-channel alert system for security events
     """
     
-    def __init__(self, alert_file='data/alerts.jsonl'):
+    def __init__(self, alert_file='data/alerts.jsonl', suppression_window=SUPPRESSION_WINDOW,
+                 channels=None):
         self.alert_file = alert_file
         os.makedirs('data', exist_ok=True)
+        self.store = AlertStore(alert_file)
+        atexit.register(self.store.save)
+        self.dispatcher = AlertDispatcher(
+            [self._build_channel(c) for c in (ALERT_CHANNELS if channels is None else channels)]
+        )
+        atexit.register(self.dispatcher.flush)
         self.alert_count = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+        self.suppression_window = suppression_window
+        self.suppressed_count = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+        # fingerprint -> open aggregate, oldest window first
+        self.active_alerts = OrderedDict()
+        self.lock = threading.Lock()
+        atexit.register(self.flush_suppressed)
+        if suppression_window:
+            # Close windows even when no further alert arrives to trigger it
+            threading.Thread(target=self._sweep_suppressed, name='alerts-suppression', daemon=True).start()
     
     def send_alert(self, severity, title, message, details=None):
         """
         Send an alert through multiple channels
         
+        Repeats of the same (severity, title, IP) inside the suppression
+        window are not re-sent; they are counted and reported as a single
+        summary alert when the window closes (checked every
+        SUPPRESSION_SWEEP seconds, and on each new alert). A higher severity has a
+        different fingerprint, so escalations always go out immediately.
+        
         Args:
             severity: 'low', 'medium', 'high', or 'critical'
             title: Short alert title
             message: Detailed message
             details: Optional dictionary with additional context
         """
-        alert_data = {
-            'timestamp': datetime.now().isoformat(),
-            'severity': severity,
-            'title': title,
-            'message': message,
-            'details': details or {}
-        }
+        now = time.time()
+        timestamp = datetime.now().isoformat()
+        details = details or {}
+        fingerprint = (severity, title, details.get('ip'))
         
-        # Console alert
-        self._console_alert(alert_data)
+        self.flush_suppressed(now)
         
-        # File alert
-        self._file_alert(alert_data)
-        
-        # Count alerts
-        self.alert_count[severity] = self.alert_count.get(severity, 0) + 1
+        with self.lock:
+            # Count alerts
+            self.alert_count[severity] = self.alert_count.get(severity, 0) + 1
+            
+            aggregate = self.active_alerts.get(fingerprint)
+            if aggregate is not None:
+                aggregate['count'] += 1
+                aggregate['last_seen'] = timestamp
+                self.suppressed_count[severity] = self.suppressed_count.get(severity, 0) + 1
+                return aggregate['alert']
+            
+            alert_data = {
+                'timestamp': timestamp,
+                'severity': severity,
+                'title': title,
+                'message': message,
+                'details': details,
+                'count': 1,
+                'first_seen': timestamp,
+                'last_seen': timestamp
+            }
+            if self.suppression_window:
+                self.active_alerts[fingerprint] = {
+                    'alert': alert_data,
+                    'count': 1,
+                    'last_seen': timestamp,
+                    'closes_at': now + self.suppression_window
+                }
         
+        self._emit(alert_data)
         return alert_data
     
-    def _console_alert(self, alert_data):
-        """Print colored alert to console"""
-        severity = alert_data['severity']
-        
-        # Color mapping
-        colors = {
-            'low': Fore.GREEN,
-            'medium': Fore.YELLOW,
-            'high': Fore.RED,
-            'critical': Fore.WHITE + Back.RED
-        }
-        
-        icons = {
-            'low': '📗',
-            'medium': '📙',
-            'high': '📕',
-            'critical': '🚨'
-        }
-        
-        color = colors.get(severity, Fore.WHITE)
-        icon = icons.get(severity, '📢')
-        
-        print(f"\n{color}{icon} ALERT [{severity.upper()}] {icon}{Style.RESET_ALL}")
-        print(f"{color}{'='*60}{Style.RESET_ALL}")
-        print(f"{color}Title: {alert_data['title']}{Style.RESET_ALL}")
-        print(f"{color}Message: {alert_data['message']}{Style.RESET_ALL}")
-        print(f"{color}Time: {alert_data['timestamp']}{Style.RESET_ALL}")
-        
-        if alert_data['details']:
-            print(f"{color}Details:{Style.RESET_ALL}")
-            for key, value in alert_data['details'].items():
-                print(f"{color}  • {key}: {value}{Style.RESET_ALL}")
+    def flush_suppressed(self, now=None):
+        """
+        Close suppression windows that have expired (all of them if now is None)
+        and send one summary alert for each window that swallowed repeats
+        """
+        summaries = []
+        with self.lock:
+            while self.active_alerts:
+                fingerprint, aggregate = next(iter(self.active_alerts.items()))
+                if now is not None and aggregate['closes_at'] > now:
+                    break
+                del self.active_alerts[fingerprint]
+                if aggregate['count'] > 1:
+                    first = aggregate['alert']
+                    summaries.append({
+                        **first,
+                        'timestamp': datetime.now().isoformat(),
+                        'message': f"{first['message']} (repeated {aggregate['count']} times)",
+                        'count': aggregate['count'],
+                        'last_seen': aggregate['last_seen'],
+                        'aggregated': True
+                    })
         
-        print(f"{color}{'='*60}{Style.RESET_ALL}\n")
+        for summary in summaries:
+            self._emit(summary)
+        return len(summaries)
     
-    def _file_alert(self, alert_data):
-        """Log alert to file"""
-        with open(self.alert_file, 'a') as f:
-            f.write(json.dumps(alert_data) + '\n')
+    def _sweep_suppressed(self):
+        interval = min(SUPPRESSION_SWEEP, self.suppression_window)
+        while True:
+            time.sleep(interval)
+            self.flush_suppressed(time.time())
     
-    def _email_alert(self, alert_data):
-        """
-        Send email alert (placeholder for future implementation)
-        
-        To implement:
-        import smtplib
-        from email.mime.text import MIMEText
-        
-        # Configure SMTP settings
-        # Send email
-        """
-        pass
+    def _emit(self, alert_data):
+        """Hand an alert to the dispatcher for every channel"""
+        self.dispatcher.dispatch(alert_data)
     
-    def _slack_alert(self, alert_data):
-        """
-        Send Slack alert (placeholder for future implementation)
-        
-        To implement:
-        import requests
-        webhook_url = 'YOUR_SLACK_WEBHOOK_URL'
-        requests.post(webhook_url, json={'text': alert_data['message']})
-        """
-        pass
+    def _build_channel(self, channel):
+        """Channel instance from a name in ALERT_CHANNELS (instances pass through)"""
+        if isinstance(channel, AlertChannel):
+            return channel
+        if channel == 'console':
+            return ConsoleChannel()
+        if channel == 'file':
+            return FileChannel(self._file_alerts)
+        if channel == 'email':
+            return SmtpChannel()
+        if channel == 'webhook':
+            return WebhookChannel()
+        raise ValueError(f"Unknown alert channel: {channel}")
+    
+    def _file_alerts(self, alerts):
+        """Log a batch of alerts to file and index it"""
+        with open(self.alert_file, 'ab') as f:
+            start = f.tell()
+            f.write(''.join(json.dumps(a) + '\n' for a in alerts).encode())
+            end = f.tell()
+        self.store.append(alerts, start, end)
     
     def get_recent_alerts(self, count=50):
-        """Get recent alerts from file"""
-        if not os.path.exists(self.alert_file):
-            return []
-        
-        alerts = []
-        with open(self.alert_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        alerts.append(json.loads(line.strip()))
-                    except:
-                        pass
-        
-        return alerts[-count:]
+        """Get recent alerts (served from the in-memory store)"""
+        # Only the file lane feeds the store; don't wait on SMTP or webhooks
+        self.dispatcher.flush(channels=('file',))
+        return self.store.get_recent(count)
     
     def get_alert_stats(self):
-        """Get alert statistics"""
+        """Get alert statistics (occurrence counts persist across restarts)"""
+        self.dispatcher.flush(channels=('file',))
+        by_severity, by_hour = self.store.get_counts()
         return {
-            'total': sum(self.alert_count.values()),
-            'by_severity': self.alert_count,
-            'recent_count': len(self.get_recent_alerts(10))
+            'total': sum(by_severity.values()),
+            'by_severity': by_severity,
+            'by_hour': by_hour,
+            'suppressed': sum(self.suppressed_count.values()),
+            'recent_count': len(self.store.get_recent(10)),
+            'channels': self.dispatcher.get_metrics()
         }
     
     def clear_alerts(self):
         """Clear all alerts"""
+        self.dispatcher.flush()
         if os.path.exists(self.alert_file):
             os.remove(self.alert_file)
+        self.store.clear()
         self.alert_count = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+        self.suppressed_count = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
+        with self.lock:
+            self.active_alerts.clear()
 
 # Global alert instance
 alert_system = AlertSystem()
@@ -164,6 +780,63 @@ def alert_critical(title, message, details=None):
     """Send critical severity alert"""
     return alert_system.send_alert('critical', title, message, details)
 
+class SmtpStandInHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP sink for testing SmtpChannel locally"""
+    
+    def handle(self):
+        self.wfile.write(b"220 localhost NeuroHoneypot SMTP stand-in\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('latin-1').strip().upper()
+            if command.startswith('DATA'):
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                message = []
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b".\r\n", b".\n"):
+                        break
+                    message.append(data.decode('utf-8', 'replace').rstrip('\r\n'))
+                subject = next((m for m in message if m.lower().startswith('subject:')), 'Subject: ?')
+                print(f"📧 SMTP stand-in received: {subject[8:].strip()} ({len(message)} lines)")
+                self.wfile.write(b"250 OK\r\n")
+            elif command.startswith('QUIT'):
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+class WebhookStandInHandler(BaseHTTPRequestHandler):
+    """Minimal webhook receiver for testing WebhookChannel locally"""
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        print(f"🪝 Webhook stand-in received {len(payload.get('alerts', []))} alert(s)")
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+def run_channel_stubs(smtp_port=SMTP_PORT, webhook_port=5004):
+    """Run local SMTP and webhook stand-ins until interrupted"""
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    smtp_server = socketserver.ThreadingTCPServer(('127.0.0.1', smtp_port), SmtpStandInHandler)
+    webhook_server = ThreadingHTTPServer(('127.0.0.1', webhook_port), WebhookStandInHandler)
+    threading.Thread(target=smtp_server.serve_forever, daemon=True).start()
+    print(f"📧 SMTP stand-in on localhost:{smtp_port}")
+    print(f"🪝 Webhook stand-in on http://localhost:{webhook_port}/alerts")
+    try:
+        webhook_server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping stand-ins...")
+    finally:
+        smtp_server.shutdown()
+        webhook_server.server_close()
+
 def main():
     """Demo the alert system"""
     print("🔔 Alert System Demo\n")
@@ -202,7 +875,13 @@ def main():
     stats = alert_system.get_alert_stats()
     print(f"Total alerts: {stats['total']}")
     print(f"By severity: {stats['by_severity']}")
+    for name, channel in stats['channels'].items():
+        print(f"Channel {name}: {channel['delivered']} delivered, "
+              f"p50 {channel['latency_ms']['p50']}ms, p99 {channel['latency_ms']['p99']}ms")
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'stubs':
+        run_channel_stubs()
+    else:
+        main()
 
@@ -0,0 +1,208 @@
+"""
+NeuroHoneypot - Columnar Log Tables
+Compact in-memory columns for the dashboard, built incrementally
+"""
+import json
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+
+# Fields kept as categorical columns, with their defaults
+SESSION_COLUMNS = {
+    'ip': 'unknown',
+    'method': '',
+    'path': '/',
+    'action': 'unknown',
+    'attack_type': 'normal',
+    'severity': 'low',
+    'user_agent': '',
+    'session_id': '',
+}
+ACTION_COLUMNS = {
+    'action': 'unknown',
+    'status': 'unknown',
+    'ip': '',
+}
+NAT = -2 ** 63                 # int64 value pandas reads as NaT
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+class CategoricalColumn:
+    """Append-only column of int32 codes into a list of distinct values"""
+    
+    def __init__(self):
+        self.codes = array('i')
+        self.categories = []
+        self.lookup = {}
+    
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+    
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes) + sum(len(c) for c in self.categories)
+
+class ColumnarTable:
+    """
+    Column-oriented index over a JSONL log.
+    
+    Each categorical field is stored as int32 codes plus its distinct
+    values, the timestamp as int64 nanoseconds since the epoch, and the
+    byte offset of every record in the log. Rows are appended as records
+    arrive (update() matches the JsonlTail listener signature), so nothing
+    is re-parsed on refresh. Filters run over the code arrays; only the
+    rows of a visible page are turned back into values, and raw records
+    are read back from the log by offset when asked for.
+    """
+    
+    def __init__(self, columns, path):
+        self.column_defaults = dict(columns)
+        self.path = path
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Drop all rows"""
+        with self.lock:
+            self.columns = {name: CategoricalColumn() for name in self.column_defaults}
+            self.timestamps = array('q')
+            self.offsets = array('q')
+            self._arrays = None
+            self._frame = None
+    
+    def update(self, records, reset=False, offsets=None):
+        """Append new records as rows"""
+        if reset:
+            self.reset()
+        with self.lock:
+            for record in records:
+                for name, default in self.column_defaults.items():
+                    value = record.get(name, default)
+                    if not isinstance(value, str):
+                        value = default if value is None else str(value)
+                    self.columns[name].append(value)
+                self.timestamps.append(_epoch_ns(record.get('timestamp')))
+            self.offsets.extend(offsets if offsets is not None else [-1] * len(records))
+            if records:
+                self._arrays = None
+                self._frame = None
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    def categories(self, name):
+        """Distinct values seen in one column"""
+        with self.lock:
+            return list(self.columns[name].categories)
+    
+    def frame(self):
+        """DataFrame view of all rows (cached until new rows arrive)"""
+        with self.lock:
+            if self._frame is None:
+                arrays = self._snapshot()
+                data = {'timestamp': pd.to_datetime(arrays['timestamp'], unit='ns')}
+                for name, column in self.columns.items():
+                    data[name] = pd.Categorical.from_codes(arrays[name], categories=column.categories)
+                self._frame = pd.DataFrame(data)
+            return self._frame
+    
+    def value_counts(self, name):
+        """{value: count} for one column, largest first"""
+        with self.lock:
+            categories = self.columns[name].categories
+            counts = np.bincount(self._snapshot()[name], minlength=len(categories))
+            order = np.argsort(counts)[::-1]
+            return {categories[i]: int(counts[i]) for i in order if counts[i]}
+    
+    def query(self, start=None, end=None, contains=None, **values):
+        """
+        Row numbers matching all filters, newest first.
+        
+        start/end bound the timestamp (naive datetimes), contains maps a
+        column to a substring its value must include, and any other keyword
+        names a column with an iterable of accepted values.
+        """
+        with self.lock:
+            arrays = self._snapshot()
+            mask = np.ones(len(self.timestamps), dtype=bool)
+            if start is not None:
+                mask &= arrays['timestamp'] >= _datetime_ns(start)
+            if end is not None:
+                mask &= (arrays['timestamp'] <= _datetime_ns(end)) & (arrays['timestamp'] != NAT)
+            for name, text in (contains or {}).items():
+                if text:
+                    categories = self.columns[name].categories
+                    codes = [code for code, value in enumerate(categories) if text in value]
+                    mask &= np.isin(arrays[name], codes)
+            for name, accepted in values.items():
+                if accepted:
+                    lookup = self.columns[name].lookup
+                    codes = [lookup[value] for value in accepted if value in lookup]
+                    mask &= np.isin(arrays[name], codes)
+            return np.flatnonzero(mask)[::-1]
+    
+    def page_frame(self, rows):
+        """DataFrame of just the given rows, in the given order"""
+        with self.lock:
+            arrays = self._snapshot()
+            data = {'timestamp': pd.to_datetime(arrays['timestamp'][rows], unit='ns')}
+            for name, column in self.columns.items():
+                categories = column.categories
+                data[name] = [categories[code] for code in arrays[name][rows]]
+            return pd.DataFrame(data)
+    
+    def read_records(self, rows):
+        """Raw records for the given rows, read from the log by offset"""
+        with self.lock:
+            offsets = [self.offsets[row] for row in rows]
+        records = [None] * len(offsets)
+        try:
+            with open(self.path, 'rb') as f:
+                for i, offset in enumerate(offsets):
+                    if offset >= 0:
+                        f.seek(offset)
+                        try:
+                            records[i] = json.loads(f.readline())
+                        except ValueError:
+                            pass
+        except OSError:
+            pass
+        return records
+    
+    def memory_usage(self):
+        """Approximate bytes held by the columns"""
+        with self.lock:
+            total = (self.timestamps.itemsize * len(self.timestamps)
+                     + self.offsets.itemsize * len(self.offsets))
+            return total + sum(c.nbytes() for c in self.columns.values())
+    
+    def _snapshot(self):
+        # numpy copies of the columns, rebuilt only after new rows; copying
+        # (rather than viewing) lets the array.arrays keep growing
+        if self._arrays is None:
+            arrays = {'timestamp': _copy(self.timestamps, np.int64)}
+            for name, column in self.columns.items():
+                arrays[name] = _copy(column.codes, np.int32)
+            self._arrays = arrays
+        return self._arrays
+
+def _copy(values, dtype):
+    return np.frombuffer(values, dtype=dtype).copy() if len(values) else np.empty(0, dtype=dtype)
+
+def _datetime_ns(dt):
+    """Naive (or UTC-converted aware) datetime -> int64 ns since the epoch"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND * 1000
+
+def _epoch_ns(timestamp):
+    """ISO timestamp -> int64 ns since the epoch, NAT if invalid"""
+    try:
+        return _datetime_ns(datetime.fromisoformat(timestamp))
+    except (TypeError, ValueError):
+        return NAT
@@ -6,8 +6,36 @@ import streamlit as st
 import pandas as pd
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
+from log_reader import JsonlTail, ChangeWatcher, file_signature
+from rollups import EventRollup, ROLLUP_DIMENSIONS
+from columnar import ColumnarTable, SESSION_COLUMNS, ACTION_COLUMNS
+
+# Logs held in columnar form only; their raw records are not retained
+COLUMNAR_LOGS = {'data/sessions.jsonl': SESSION_COLUMNS, 'data/actions.jsonl': ACTION_COLUMNS}
+PAGE_SIZES = [25, 50, 100, 200]
+
+# Files whose changes trigger an auto-refresh, and how often the browser
+# asks whether any did (a version comparison, not a reload)
+WATCHED_FILES = [
+    'data/sessions.jsonl',
+    'data/actions.jsonl',
+    'data/alerts.jsonl',
+    'data/cluster_analysis.json',
+    'data/rl_policy.json',
+]
+REFRESH_CHECK_INTERVAL = 1
+
+# Activity timeline ranges (None = all history)
+TIMELINE_RANGES = {
+    'Last hour': timedelta(hours=1),
+    'Last 6 hours': timedelta(hours=6),
+    'Last 24 hours': timedelta(days=1),
+    'Last 7 days': timedelta(days=7),
+    'Last 30 days': timedelta(days=30),
+    'All history': None,
+}
 
 # Page configuration
 st.set_page_config(
@@ -327,59 +355,107 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Shared across reruns and browser sessions: each log is tailed once per
+# server process and only newly appended bytes are parsed on refresh
+@st.cache_resource
+def get_log_tail(path):
+    """Shared incremental reader for a JSONL log"""
+    return JsonlTail(path, retain=path not in COLUMNAR_LOGS)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_json_file(path, signature):
+    """Parse a JSON file; cached until its (mtime, size) signature changes"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+@st.cache_resource
+def get_rollup(path, kind):
+    """Shared rollup kept current by the log's tail"""
+    rollup = EventRollup(ROLLUP_DIMENSIONS[kind])
+    get_log_tail(path).add_listener(rollup.update)
+    return rollup
+
+@st.cache_resource
+def get_log_table(path):
+    """Shared columnar table kept current by the log's tail"""
+    table = ColumnarTable(COLUMNAR_LOGS[path], path)
+    get_log_tail(path).add_listener(table.update)
+    return table
+
+def load_table(path):
+    """Load a JSONL log into its columnar table (cached, incremental)"""
+    table = get_log_table(path)
+    get_log_tail(path).poll()
+    return table
+
+@st.cache_resource
+def get_change_watcher():
+    """Single background watcher shared by every browser session"""
+    return ChangeWatcher(WATCHED_FILES)
+
+@st.fragment(run_every=REFRESH_CHECK_INTERVAL)
+def watch_for_changes():
+    """Rerun the app only once the watcher has seen new data"""
+    if get_change_watcher().get_version() != st.session_state.get('data_version'):
+        st.rerun()
+
+def load_jsonl(path):
+    """Load all records of a JSONL log (cached, incremental)"""
+    tail = get_log_tail(path)
+    tail.poll()
+    return tail.records
+
 def load_sessions():
     """Load sessions from JSONL file"""
-    sessions = []
-    if os.path.exists('data/sessions.jsonl'):
-        with open('data/sessions.jsonl', 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        sessions.append(json.loads(line.strip()))
-                    except:
-                        pass
-    return sessions
+    return load_table('data/sessions.jsonl')
 
 def load_actions():
     """Load actions from JSONL file"""
-    actions = []
-    if os.path.exists('data/actions.jsonl'):
-        with open('data/actions.jsonl', 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        actions.append(json.loads(line.strip()))
-                    except:
-                        pass
-    return actions
+    return load_table('data/actions.jsonl')
 
 def load_cluster_analysis():
     """Load cluster analysis if available"""
-    if os.path.exists('data/cluster_analysis.json'):
-        with open('data/cluster_analysis.json', 'r') as f:
-            return json.load(f)
+    signature = file_signature('data/cluster_analysis.json')
+    if signature:
+        return load_json_file('data/cluster_analysis.json', signature)
     return None
 
 def load_alerts():
     """Load alerts from JSONL file"""
-    alerts = []
-    if os.path.exists('data/alerts.jsonl'):
-        with open('data/alerts.jsonl', 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        alerts.append(json.loads(line.strip()))
-                    except:
-                        pass
-    return alerts
+    return load_jsonl('data/alerts.jsonl')
+
+def alert_occurrences(alert):
+    """
+    Occurrences an alerts.jsonl row stands for, counted the way AlertStore
+    does: a suppression summary covers count repeats, the first of which
+    was already logged as its own row
+    """
+    if alert.get('aggregated'):
+        return alert.get('count', 1) - 1
+    return 1
 
 def load_rl_policy():
     """Load RL agent policy if available"""
-    if os.path.exists('data/rl_policy.json'):
-        with open('data/rl_policy.json', 'r') as f:
-            return json.load(f)
+    signature = file_signature('data/rl_policy.json')
+    if signature:
+        return load_json_file('data/rl_policy.json', signature)
     return None
 
+def paginate(rows, key):
+    """Page controls over a row index; returns the rows of the selected page"""
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f'{key}_page_size')
+    pages = max(1, -(-len(rows) // page_size))
+    if st.session_state.get(f'{key}_page', 1) > pages:
+        st.session_state[f'{key}_page'] = 1
+    with col2:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f'{key}_page')
+    start = (page - 1) * page_size
+    st.caption(f"Showing {min(start + 1, len(rows))}-{min(start + page_size, len(rows))} of {len(rows)} matching rows")
+    return rows[start:start + page_size]
+
 def load_anomaly_results():
     """Check if anomaly detector model exists"""
     return os.path.exists('data/anomaly_model.pkl')
@@ -390,7 +466,7 @@ st.markdown('<div class="subtitle">[ AI-POWERED THREAT INTELLIGENCE & ADAPTIVE R
 
 # Sidebar
 st.sidebar.title("⚙️ Controls")
-auto_refresh = st.sidebar.checkbox("Auto-refresh (5s)", value=True)
+auto_refresh = st.sidebar.checkbox("Auto-refresh (on new data)", value=True)
 show_details = st.sidebar.checkbox("Show detailed logs", value=False)
 
 if st.sidebar.button("🔄 Refresh Now"):
@@ -410,18 +486,25 @@ if st.sidebar.button("🗑️ Clear Data"):
 st.sidebar.markdown("---")
 
 # Load data FIRST (before using it!)
+# Note the data version before loading so a write during the load
+# still triggers the next refresh
+st.session_state['data_version'] = get_change_watcher().get_version()
+session_stats = get_rollup('data/sessions.jsonl', 'sessions')
+action_stats = get_rollup('data/actions.jsonl', 'actions')
 sessions = load_sessions()
 actions = load_actions()
 cluster_analysis = load_cluster_analysis()
 alerts = load_alerts()
 rl_policy = load_rl_policy()
 has_anomaly_detector = load_anomaly_results()
+severity_totals = session_stats.get_counts('severity')
+attack_type_totals = session_stats.get_counts('attack_type')
 
 # NOW we can use the loaded data
 st.sidebar.markdown("### 📊 SYSTEM HEALTH")
 
 # System Status Indicators
-if sessions and len(sessions) > 0:
+if len(sessions) > 0:
     st.sidebar.markdown('<div class="status-badge status-online">● OPERATIONAL</div>', unsafe_allow_html=True)
 else:
     st.sidebar.markdown('<div class="status-badge status-warning">● STANDBY</div>', unsafe_allow_html=True)
@@ -436,8 +519,8 @@ st.sidebar.markdown("```")
 
 # Threat Assessment
 if sessions:
-    critical_count = len([s for s in sessions if s.get('severity') == 'critical'])
-    high_count = len([s for s in sessions if s.get('severity') == 'high'])
+    critical_count = severity_totals.get('critical', 0)
+    high_count = severity_totals.get('high', 0)
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### ⚠️ THREAT ASSESSMENT")
@@ -462,11 +545,11 @@ with col1:
     st.metric(
         label="📊 Total Sessions",
         value=len(sessions),
-        delta=f"+{len([s for s in sessions[-10:]])} recent"
+        delta=f"+{min(len(sessions), 10)} recent"
     )
 
 with col2:
-    unique_ips = len(set(s.get('ip', 'unknown') for s in sessions))
+    unique_ips = session_stats.get_summary()['unique_ips']
     st.metric(
         label="🌐 Unique IPs",
         value=unique_ips
@@ -479,11 +562,11 @@ with col3:
     )
 
 with col4:
-    attack_sessions = [s for s in sessions if s.get('attack_type', 'normal') != 'normal']
+    attack_sessions = len(sessions) - attack_type_totals.get('normal', 0)
     st.metric(
         label="🎯 Attack Attempts",
-        value=len(attack_sessions),
-        delta=f"{(len(attack_sessions)/max(len(sessions), 1)*100):.1f}%"
+        value=attack_sessions,
+        delta=f"{(attack_sessions/max(len(sessions), 1)*100):.1f}%"
     )
 
 # AI/ML Systems Status
@@ -510,11 +593,12 @@ with col3:
 
 with col4:
     if alerts:
-        critical_alerts = len([a for a in alerts if a.get('severity') == 'critical'])
+        total_alerts = sum(alert_occurrences(a) for a in alerts)
+        critical_alerts = sum(alert_occurrences(a) for a in alerts if a.get('severity') == 'critical')
         if critical_alerts > 0:
-            st.error(f"🔴 {len(alerts)} Alerts ({critical_alerts} critical)")
+            st.error(f"🔴 {total_alerts} Alerts ({critical_alerts} critical)")
         else:
-            st.warning(f"🟡 {len(alerts)} Alerts")
+            st.warning(f"🟡 {total_alerts} Alerts")
     else:
         st.info("⚪ No Alerts")
 
@@ -535,21 +619,35 @@ with tab1:
     st.subheader("Recent Attack Sessions")
     
     if sessions:
-        # Display recent sessions
-        recent_sessions = sessions[-50:][::-1]  # Last 50, reversed
+        # Filters run over the columnar index; only the visible page is built
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            ip_filter = st.text_input("IP contains", key='sessions_ip')
+        with col2:
+            attack_filter = st.multiselect("Attack type", sorted(sessions.categories('attack_type')), key='sessions_attack_type')
+        with col3:
+            severity_filter = st.multiselect("Severity", sorted(sessions.categories('severity')), key='sessions_severity')
+        with col4:
+            sessions_range = st.selectbox("Time range", list(TIMELINE_RANGES), index=len(TIMELINE_RANGES) - 1, key='sessions_range')
         
-        session_data = []
-        for session in recent_sessions:
-            session_data.append({
-                'Time': session.get('timestamp', '')[:19],
-                'IP': session.get('ip', 'unknown'),
-                'Action': session.get('action', 'unknown'),
-                'Attack Type': session.get('attack_type', 'normal'),
-                'Severity': session.get('severity', 'low'),
-                'Path': session.get('path', '/'),
-            })
+        window = TIMELINE_RANGES[sessions_range]
+        rows = sessions.query(
+            start=datetime.now() - window if window else None,
+            contains={'ip': ip_filter.strip()},
+            attack_type=attack_filter,
+            severity=severity_filter
+        )
+        page_rows = paginate(rows, 'sessions')
+        page = sessions.page_frame(page_rows)
         
-        df = pd.DataFrame(session_data)
+        df = pd.DataFrame({
+            'Time': page['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S').fillna(''),
+            'IP': page['ip'],
+            'Action': page['action'],
+            'Attack Type': page['attack_type'],
+            'Severity': page['severity'],
+            'Path': page['path'],
+        })
         
         # Apply color coding
         def color_severity(val):
@@ -564,10 +662,12 @@ with tab1:
         styled_df = df.style.applymap(color_severity, subset=['Severity'])
         st.dataframe(styled_df, use_container_width=True, height=400)
         
-        if show_details:
+        if show_details and len(page_rows):
             st.subheader("Detailed Session View")
-            selected_idx = st.selectbox("Select session", range(len(recent_sessions)), format_func=lambda x: f"Session {x+1}: {recent_sessions[x].get('ip', 'unknown')}")
-            st.json(recent_sessions[selected_idx])
+            page_ips = list(df['IP'])
+            selected_idx = st.selectbox("Select session", range(len(page_rows)), format_func=lambda x: f"Session {x+1}: {page_ips[x]}")
+            # Raw record is read from the log by offset, only when viewed
+            st.json(sessions.read_records([page_rows[selected_idx]])[0] or {})
     else:
         st.info("No sessions recorded yet. Start the honeypot and attacker to generate data.")
 
@@ -576,24 +676,37 @@ with tab2:
     st.subheader("Orchestrator Actions")
     
     if actions:
-        recent_actions = actions[-50:][::-1]  # Last 50, reversed
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            action_ip_filter = st.text_input("IP contains", key='actions_ip')
+        with col2:
+            action_filter = st.multiselect("Action", sorted(actions.categories('action')), key='actions_action')
+        with col3:
+            actions_range = st.selectbox("Time range", list(TIMELINE_RANGES), index=len(TIMELINE_RANGES) - 1, key='actions_range')
         
-        action_data = []
-        for action in recent_actions:
-            action_data.append({
-                'Time': action.get('timestamp', '')[:19],
-                'Action': action.get('action', 'unknown'),
-                'Details': str(action.get('reason', action.get('message', '')))[:50],
-                'Status': action.get('status', 'unknown'),
-            })
+        window = TIMELINE_RANGES[actions_range]
+        rows = actions.query(
+            start=datetime.now() - window if window else None,
+            contains={'ip': action_ip_filter.strip()},
+            action=action_filter
+        )
+        page_rows = paginate(rows, 'actions')
+        page = actions.page_frame(page_rows)
+        # Details are not indexed; read just this page's records
+        details = [str((a or {}).get('reason', (a or {}).get('message', '')))[:50]
+                   for a in actions.read_records(page_rows)]
         
-        df = pd.DataFrame(action_data)
+        df = pd.DataFrame({
+            'Time': page['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S').fillna(''),
+            'Action': page['action'],
+            'Details': details,
+            'Status': page['status'],
+        })
         st.dataframe(df, use_container_width=True, height=400)
         
         # Action type distribution
         st.subheader("Action Distribution")
-        action_types = [a.get('action', 'unknown') for a in actions]
-        action_counts = pd.Series(action_types).value_counts()
+        action_counts = pd.Series(action_stats.get_counts('action')).sort_values(ascending=False)
         st.bar_chart(action_counts)
     else:
         st.info("No actions taken yet. Run the decision engine to start analyzing threats.")
@@ -640,39 +753,32 @@ with tab4:
         
         with col1:
             st.markdown("**Attack Types Distribution**")
-            attack_types = [s.get('attack_type', 'normal') for s in sessions]
-            attack_counts = pd.Series(attack_types).value_counts()
+            attack_counts = pd.Series(attack_type_totals).sort_values(ascending=False)
             st.bar_chart(attack_counts)
         
         with col2:
             st.markdown("**Severity Levels**")
-            severities = [s.get('severity', 'low') for s in sessions]
-            severity_counts = pd.Series(severities).value_counts()
+            severity_counts = pd.Series(severity_totals).sort_values(ascending=False)
             st.bar_chart(severity_counts)
         
         # Timeline
         st.markdown("**Activity Timeline**")
-        if len(sessions) > 0:
-            timeline_data = []
-            for session in sessions:
-                try:
-                    timestamp = datetime.fromisoformat(session.get('timestamp', ''))
-                    timeline_data.append({
-                        'timestamp': timestamp,
-                        'count': 1
-                    })
-                except:
-                    pass
-            
-            if timeline_data:
-                timeline_df = pd.DataFrame(timeline_data)
-                timeline_df = timeline_df.set_index('timestamp')
-                timeline_df = timeline_df.resample('1min').sum()
-                st.line_chart(timeline_df)
+        timeline_range = st.selectbox("Time range", list(TIMELINE_RANGES), index=2, key='timeline_range')
+        window = TIMELINE_RANGES[timeline_range]
+        timeline, resolution = session_stats.get_timeline(
+            start=datetime.now() - window if window else None
+        )
+        if timeline:
+            times, counts = zip(*timeline)
+            timeline_df = pd.DataFrame({f'sessions / {resolution}': counts}, index=pd.DatetimeIndex(times))
+            st.line_chart(timeline_df)
+            st.caption(f"{len(timeline)} points, per-{resolution} counts (min/max per bin when downsampled)")
+        else:
+            st.info(f"No sessions in the selected range ({timeline_range.lower()}).")
         
         # Top attackers
         st.markdown("**Top Attacking IPs**")
-        ip_counts = pd.Series([s.get('ip', 'unknown') for s in sessions]).value_counts().head(10)
+        ip_counts = pd.Series(dict(session_stats.get_top_ips(10)))
         st.bar_chart(ip_counts)
         
     else:
@@ -689,7 +795,7 @@ with tab5:
         severity_counts = {'low': 0, 'medium': 0, 'high': 0, 'critical': 0}
         for alert in alerts:
             severity = alert.get('severity', 'low')
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+            severity_counts[severity] = severity_counts.get(severity, 0) + alert_occurrences(alert)
         
         with col1:
             st.metric("🟢 Low", severity_counts['low'])
@@ -855,10 +961,10 @@ python ai/feature_cluster.py
 python export_data.py all
     """, language="bash")
 
-# Auto-refresh
+# Auto-refresh: a cheap fragment polls the watcher's version and reruns
+# the whole app (every tab) only when a watched file changed
 if auto_refresh:
-    time.sleep(5)
-    st.rerun()
+    watch_for_changes()
 
 # Footer
 st.markdown("---")
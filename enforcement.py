@@ -0,0 +1,425 @@
+"""
+NeuroHoneypot - Enforcement Backends
+Push orchestrator decisions (blocks, rate limits) to firewalls and proxies
+"""
+import ipaddress
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ENFORCEMENT_DIR = 'data/enforcement'
+PROXY_URL = "http://localhost:5003"
+BATCH_LINGER = 0.05        # seconds to wait for more changes before applying a batch
+RETRY_DELAY = 2.0          # seconds before a failed batch is retried
+LATENCY_SAMPLES = 1000     # apply latencies kept per backend for percentiles
+
+class EnforcementBackend:
+    """
+    Base class for enforcement backends.
+    
+    A backend receives coalesced batches of changes. Each change is a tuple
+    (kind, key, old, new): kind is 'block' or 'rate_limit', key is the IP,
+    old is the value currently enforced (None if absent) and new is the
+    desired value (None to remove). Subclasses implement apply(); the base
+    class tracks what has been enforced so only real differences are sent.
+    """
+    
+    name = 'base'
+    
+    def __init__(self):
+        self.applied = {}
+    
+    def plan(self, ops):
+        """Turn coalesced {(kind, key): value} ops into changes against applied state"""
+        changes = []
+        for (kind, key), value in ops.items():
+            current = self.applied.get((kind, key))
+            if current != value:
+                changes.append((kind, key, current, value))
+        return changes
+    
+    def commit(self, changes):
+        """Record a successfully applied batch"""
+        for kind, key, _, new in changes:
+            if new is None:
+                self.applied.pop((kind, key), None)
+            else:
+                self.applied[(kind, key)] = new
+    
+    def apply(self, changes):
+        """Push a batch of changes to the enforcement point"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+class RuleFileBackend(EnforcementBackend):
+    """
+    Write firewall rule files for nftables (nft -f) or ipset (ipset restore).
+    
+    At startup a base ruleset that resets everything this backend manages
+    is written to base.<ext> and as the next numbered batch; every batch
+    after that is a small delta file holding only the added and removed
+    elements, ready to be applied in order by an agent on the firewall host.
+    Numbering continues from the batches already on disk, so a restart
+    never overwrites files the agent may not have applied yet. Rate limits
+    meter each source address separately, so IPs sharing a limit never
+    share a token bucket.
+    """
+    
+    TABLE = 'inet neurohoneypot'
+    
+    def __init__(self, style='nftables', directory=None):
+        super().__init__()
+        if style not in ('nftables', 'ipset'):
+            raise ValueError(f"Unknown rule style: {style}")
+        self.style = style
+        self.name = style
+        self.directory = directory or os.path.join(ENFORCEMENT_DIR, style)
+        self.extension = 'nft' if style == 'nftables' else 'ipset'
+        self.rate_sets = set()
+        os.makedirs(self.directory, exist_ok=True)
+        self.batch_number, previous_sets = self._scan_batches()
+        base = self._base_rules(previous_sets)
+        self._write('base', base)
+        self.batch_number += 1
+        self._write(f"batch_{self.batch_number:06d}", base)
+    
+    def apply(self, changes):
+        lines = []
+        deletes, adds = {}, {}
+        for kind, ip, old, new in changes:
+            if old is not None:
+                deletes.setdefault(self._set_name(kind, ip, old), []).append(ip)
+            if new is not None:
+                lines.extend(self._ensure_rate_set(kind, ip, new))
+                adds.setdefault(self._set_name(kind, ip, new), []).append(ip)
+        # One statement per set and operation, so a batch is one atomic apply
+        for op, by_set in (('delete', deletes), ('add', adds)):
+            for name, ips in by_set.items():
+                lines.extend(self._elements(op, name, ips))
+        if lines:
+            self.batch_number += 1
+            self._write(f"batch_{self.batch_number:06d}", lines)
+    
+    def _set_name(self, kind, ip, value):
+        family = '6' if ':' in ip else '4'
+        if kind == 'block':
+            return f"blocklist{family}"
+        return f"ratelimit{family}_{value}"
+    
+    def _scan_batches(self):
+        """(highest batch number on disk, ipset sets created by earlier runs)"""
+        last = 0
+        sets = set()
+        for filename in os.listdir(self.directory):
+            stem, extension = os.path.splitext(filename)
+            if not stem.startswith('batch_') or extension != '.' + self.extension:
+                continue
+            try:
+                last = max(last, int(stem[len('batch_'):]))
+            except ValueError:
+                continue
+            if self.style == 'ipset':
+                with open(os.path.join(self.directory, filename)) as f:
+                    sets.update(line.split()[1] for line in f if line.startswith('create '))
+        return last, sets
+    
+    def _base_rules(self, previous_sets=()):
+        if self.style == 'ipset':
+            # Sets from earlier runs (rate limits) are emptied, not destroyed,
+            # since firewall rules outside this file may still reference them
+            stale = sorted(set(previous_sets) - {'neurohoneypot-blocklist4', 'neurohoneypot-blocklist6'})
+            return [
+                "create neurohoneypot-blocklist4 hash:ip family inet -exist",
+                "create neurohoneypot-blocklist6 hash:ip family inet6 -exist",
+                "flush neurohoneypot-blocklist4",
+                "flush neurohoneypot-blocklist6",
+            ] + [f"flush {name}" for name in stale]
+        # Add-then-delete drops the table from an earlier run (rules, rate
+        # limit sets and meters included) without failing when it is absent
+        return [
+            f"add table {self.TABLE}",
+            f"delete table {self.TABLE}",
+            f"add table {self.TABLE}",
+            f"add set {self.TABLE} blocklist4 {{ type ipv4_addr; }}",
+            f"add set {self.TABLE} blocklist6 {{ type ipv6_addr; }}",
+            f"add chain {self.TABLE} input {{ type filter hook input priority 0; }}",
+            f"add rule {self.TABLE} input ip saddr @blocklist4 drop",
+            f"add rule {self.TABLE} input ip6 saddr @blocklist6 drop",
+        ]
+    
+    def _ensure_rate_set(self, kind, ip, value):
+        """Declare the per-limit set (and its rule) the first time a limit is used"""
+        if kind != 'rate_limit':
+            return []
+        name = self._set_name(kind, ip, value)
+        if name in self.rate_sets:
+            return []
+        self.rate_sets.add(name)
+        family = 'ipv6_addr' if ':' in ip else 'ipv4_addr'
+        if self.style == 'ipset':
+            inet = 'inet6' if ':' in ip else 'inet'
+            return [f"create neurohoneypot-{name} hash:ip family {inet} -exist"]
+        match = 'ip6 saddr' if ':' in ip else 'ip saddr'
+        return [
+            f"add set {self.TABLE} {name} {{ type {family}; }}",
+            f"add set {self.TABLE} {name}_meter {{ type {family}; flags dynamic; timeout 1m; }}",
+            f"add rule {self.TABLE} input {match} @{name} "
+            f"update @{name}_meter {{ {match} limit rate over {value}/minute }} drop",
+        ]
+    
+    def _elements(self, op, name, ips):
+        if self.style == 'ipset':
+            verb = 'add' if op == 'add' else 'del'
+            return [f"{verb} neurohoneypot-{name} {ip} -exist" for ip in ips]
+        return [f"{op} element {self.TABLE} {name} {{ {', '.join(ips)} }}"]
+    
+    def _write(self, stem, lines):
+        path = os.path.join(self.directory, f"{stem}.{self.extension}")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f"# NeuroHoneypot {self.style} rules - {datetime.now().isoformat()}\n")
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+class HttpProxyBackend(EnforcementBackend):
+    """Send batched blocklist updates to an HTTP proxy control API"""
+    
+    name = 'proxy'
+    
+    def __init__(self, url=PROXY_URL, timeout=5):
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+    
+    def apply(self, changes):
+        payload = {'add': [], 'remove': []}
+        for kind, ip, old, new in changes:
+            if new is None:
+                payload['remove'].append({'kind': kind, 'ip': ip})
+            else:
+                payload['add'].append({'kind': kind, 'ip': ip, 'value': new})
+        response = self.session.post(f"{self.url}/blocklist", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+    
+    def close(self):
+        self.session.close()
+
+# Backend registry - plugins can add their own with register_backend()
+BACKENDS = {
+    'nftables': lambda: RuleFileBackend('nftables'),
+    'ipset': lambda: RuleFileBackend('ipset'),
+    'proxy': lambda: HttpProxyBackend(),
+}
+
+def register_backend(name, factory):
+    """Register a backend factory under a name usable in ENFORCEMENT_BACKENDS"""
+    BACKENDS[name] = factory
+
+def create_backend(name):
+    """Instantiate a registered backend by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown enforcement backend: {name}")
+    return BACKENDS[name]()
+
+class _BackendSlot:
+    """Pending ops and metrics for one backend inside the manager"""
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.scheduled = False
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.stats = {'batches': 0, 'changes': 0, 'coalesced': 0, 'errors': 0, 'last_error': None}
+
+class EnforcementManager:
+    """
+    Apply enforcement changes on a worker pool behind a queue.
+    
+    submit() only records the desired state and returns. Changes for the
+    same (kind, ip) are coalesced while a backend is busy, each backend has
+    at most one batch in flight (so its deltas stay ordered), and different
+    backends are served in parallel by the pool.
+    """
+    
+    def __init__(self, backends, workers=4, linger=BATCH_LINGER):
+        self.slots = [_BackendSlot(b) for b in backends]
+        self.linger = linger
+        self.jobs = queue.Queue()
+        self.workers = []
+        for i in range(workers if self.slots else 0):
+            worker = threading.Thread(target=self._work, name=f"enforcement-{i}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+    
+    def submit(self, kind, ip, value=True):
+        """
+        Request that ip be enforced as kind (value None removes it).
+        
+        Raises ValueError if validate_target() rejects the change.
+        """
+        ip, value = validate_target(kind, ip, value)
+        for slot in self.slots:
+            with slot.lock:
+                if (kind, ip) in slot.pending:
+                    slot.stats['coalesced'] += 1
+                slot.pending[(kind, ip)] = value
+                schedule = not slot.scheduled
+                slot.scheduled = True
+            if schedule:
+                self.jobs.put((time.monotonic() + self.linger, slot))
+    
+    def get_metrics(self):
+        """Per-backend batch counts, queue depth and apply latency percentiles"""
+        metrics = {}
+        for slot in self.slots:
+            latencies = sorted(slot.latencies)
+            with slot.lock:
+                pending = len(slot.pending)
+            metrics[slot.backend.name] = {
+                **slot.stats,
+                'pending': pending,
+                'enforced': len(slot.backend.applied),
+                'latency_ms': {
+                    'p50': round(_percentile(latencies, 50) * 1000, 3),
+                    'p99': round(_percentile(latencies, 99) * 1000, 3),
+                    'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+                }
+            }
+        return metrics
+    
+    def _work(self):
+        while True:
+            not_before, slot = self.jobs.get()
+            delay = not_before - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            
+            with slot.lock:
+                ops, slot.pending = slot.pending, {}
+            
+            changes = slot.backend.plan(ops)
+            try:
+                if changes:
+                    start = time.perf_counter()
+                    slot.backend.apply(changes)
+                    slot.latencies.append(time.perf_counter() - start)
+                    slot.backend.commit(changes)
+                    slot.stats['batches'] += 1
+                    slot.stats['changes'] += len(changes)
+                retry_at = None
+            except Exception as e:
+                slot.stats['errors'] += 1
+                slot.stats['last_error'] = f"{datetime.now().isoformat()} {e}"
+                with slot.lock:
+                    # Newer submissions win over the failed ones
+                    for key, value in ops.items():
+                        slot.pending.setdefault(key, value)
+                retry_at = time.monotonic() + RETRY_DELAY
+            
+            with slot.lock:
+                if slot.pending:
+                    next_run = retry_at or time.monotonic() + self.linger
+                    self.jobs.put((next_run, slot))
+                else:
+                    slot.scheduled = False
+
+def validate_target(kind, ip, value=True):
+    """
+    Check a requested change before it reaches a backend.
+    
+    Returns (ip, value) with the IP in canonical form. Raises ValueError for
+    an unknown kind, an invalid IP, or a rate limit that is not a positive
+    integer (requests per minute); rule files are built from these strings.
+    """
+    if kind not in ('block', 'rate_limit'):
+        raise ValueError(f"Unknown enforcement kind: {kind}")
+    try:
+        # Strings only: ip_address() would also turn an int into an address
+        ip = str(ipaddress.ip_address(ip if isinstance(ip, str) else ''))
+    except ValueError:
+        raise ValueError(f"Invalid IP address: {ip!r}")
+    if kind == 'rate_limit' and value is not None:
+        if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+            raise ValueError(f"Rate limit must be a positive integer, got {value!r}")
+    return ip, value
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+class ProxyStandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a proxy control API, used to exercise HttpProxyBackend"""
+    
+    blocklist = {}
+    lock = threading.Lock()
+    
+    def do_POST(self):
+        if self.path != '/blocklist':
+            self.send_error(404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        with self.lock:
+            for entry in payload.get('remove', []):
+                self.blocklist.pop((entry['kind'], entry['ip']), None)
+            for entry in payload.get('add', []):
+                self.blocklist[(entry['kind'], entry['ip'])] = entry.get('value')
+            size = len(self.blocklist)
+        self._send_json({'success': True, 'entries': size})
+    
+    def do_GET(self):
+        if self.path != '/blocklist':
+            self.send_error(404)
+            return
+        with self.lock:
+            entries = [{'kind': k, 'ip': ip, 'value': v} for (k, ip), v in self.blocklist.items()]
+        self._send_json({'entries': entries, 'count': len(entries)})
+    
+    def _send_json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def run_proxy_stand_in(port=5003):
+    """Run the proxy stand-in until interrupted"""
+    server = ThreadingHTTPServer(('0.0.0.0', port), ProxyStandInHandler)
+    print(f"🧱 Proxy stand-in listening on http://localhost:{port}/blocklist")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping proxy stand-in...")
+    finally:
+        server.server_close()
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == 'proxy':
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 5003
+        run_proxy_stand_in(port)
+    else:
+        print("Usage: python enforcement.py proxy [port]")
+        print("Available backends:", ', '.join(BACKENDS))
+
+if __name__ == '__main__':
+    main()
@@ -2,137 +2,543 @@
 NeuroHoneypot - Data Export Utility
 Export sessions, actions, and analysis to various formats
 """
+import argparse
 import json
 import csv
+import gzip
 import os
-from datetime import datetime
-import sys
+import re
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from rollups import EventRollup, ROLLUP_DIMENSIONS, TOP_K_FIELDS
 
-class DataExporter:
-    """Export honeypot data to various formats"""
+# Optional: Parquet export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Logs read by the exporter, in the order they are streamed
+EXPORT_LOGS = [
+    ('sessions', 'data/sessions.jsonl'),
+    ('actions', 'data/actions.jsonl'),
+]
+SESSION_CSV_FIELDS = [
+    'timestamp', 'ip', 'method', 'path', 'action',
+    'attack_type', 'severity', 'user_agent', 'session_id'
+]
+ACTION_CSV_FIELDS = ['timestamp', 'action', 'status', 'reason', 'message', 'ip']
+GZIP_LEVEL = 6                 # gzip compression level for --gzip exports
+PARQUET_ROW_GROUP = 50000      # rows buffered per Parquet row group
+DELTA_FORMATS = ['ndjson', 'json', 'csv', 'parquet']
+
+# Time-filtered exports binary-search the log by timestamp; these bound how
+# far out of order records may be and when the search stops narrowing
+SEEK_SLACK = timedelta(minutes=5)
+SEEK_BLOCK = 64 * 1024
+PARALLEL_CHUNK = 64 * 1024 * 1024  # bytes of log per worker task in parallel exports
+
+# Parquet columns per log: 'category' = dictionary-encoded string,
+# 'map' = string-to-string map; fields not listed go to a JSON 'extra' column
+PARQUET_COLUMNS = {
+    'sessions': {
+        'timestamp': 'timestamp', 'ip': 'category', 'method': 'category',
+        'path': 'category', 'action': 'category', 'attack_type': 'category',
+        'severity': 'category', 'user_agent': 'category', 'session_id': 'string',
+        'args': 'map', 'form': 'map', 'headers': 'map',
+    },
+    'actions': {
+        'timestamp': 'timestamp', 'action': 'category', 'status': 'category',
+        'ip': 'category', 'reason': 'string', 'message': 'string',
+    },
+}
+
+def _stamp():
+    return datetime.now().strftime('%Y%m%d_%H%M%S')
+
+def _open_text(filepath, compress=False, stitched=False):
+    """Text file for writing, gzip-compressed on the fly if asked"""
+    if stitched:
+        return StitchedFile(filepath, compress)
+    if compress:
+        return gzip.open(filepath, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+    return open(filepath, 'w', encoding='utf-8')
+
+class StitchedFile:
+    """
+    Output file of a parallel export, assembled from worker part files.
     
-    def __init__(self):
-        self.output_dir = 'exports'
-        os.makedirs(self.output_dir, exist_ok=True)
+    Text written directly (headers, separators, statistics) is buffered
+    and flushed ahead of each appended part. When compressing, every
+    flush is its own gzip member and the parts are gzip members written
+    by the workers, copied as is: concatenated members form one valid
+    gzip stream, so compression also runs in parallel.
+    """
     
-    def load_sessions(self):
-        """Load all sessions from JSONL"""
-        sessions = []
-        if os.path.exists('data/sessions.jsonl'):
-            with open('data/sessions.jsonl', 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            sessions.append(json.loads(line.strip()))
-                        except:
-                            pass
-        return sessions
+    def __init__(self, filepath, compress=False):
+        self.file = open(filepath, 'wb')
+        self.compress = compress
+        self.pending = []
     
-    def load_actions(self):
-        """Load all actions from JSONL"""
-        actions = []
-        if os.path.exists('data/actions.jsonl'):
-            with open('data/actions.jsonl', 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            actions.append(json.loads(line.strip()))
-                        except:
-                            pass
-        return actions
+    def write(self, text):
+        self.pending.append(text)
     
-    def export_sessions_to_csv(self, filename=None):
-        """Export sessions to CSV format"""
-        if filename is None:
-            filename = f"sessions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        sessions = self.load_sessions()
-        
-        if not sessions:
-            print("⚠️  No sessions to export")
+    def append(self, part_path):
+        """Copy a part file to the end of the output and delete it"""
+        self._flush()
+        with open(part_path, 'rb') as part:
+            shutil.copyfileobj(part, self.file, 1024 * 1024)
+        os.remove(part_path)
+    
+    def close(self):
+        self._flush()
+        self.file.close()
+    
+    def _flush(self):
+        if self.pending:
+            data = ''.join(self.pending).encode('utf-8')
+            self.pending = []
+            self.file.write(gzip.compress(data, GZIP_LEVEL) if self.compress else data)
+
+class ExportSink:
+    """
+    Destination for one streaming pass over the logs.
+    
+    The exporter calls begin() once, add(kind, record) for every record
+    (all sessions, then all actions) and finish(stats) at the end, which
+    returns the written file path or None. Sinks must not hold on to
+    records, so memory stays flat however large the logs are.
+    
+    Splittable sinks also take part in parallel exports: part(kind, index)
+    returns a sink for one chunk of one log (or None if the chunk is of no
+    interest), which runs in a worker process; whatever its finish(None)
+    returns is passed to join() in the main process, chunk by chunk in
+    log order. There, stitched is set before begin() so that output files
+    are opened as StitchedFile.
+    """
+    
+    splittable = False
+    stitched = False
+    
+    def begin(self):
+        pass
+    
+    def add(self, kind, record):
+        pass
+    
+    def finish(self, stats):
+        return None
+    
+    def part(self, kind, index):
+        return None
+    
+    def join(self, kind, result):
+        pass
+    
+    def _close_part(self):
+        """Close a worker's part file: (path, record count), or None if empty"""
+        self.file.close()
+        if not self.count:
+            os.remove(self.filepath)
             return None
-        
-        # Define CSV columns
-        fieldnames = [
-            'timestamp', 'ip', 'method', 'path', 'action',
-            'attack_type', 'severity', 'user_agent', 'session_id'
-        ]
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            
-            for session in sessions:
-                writer.writerow(session)
-        
-        print(f"✅ Exported {len(sessions)} sessions to {filepath}")
-        return filepath
+        return self.filepath, self.count
+
+class CsvSink(ExportSink):
+    """One log as CSV"""
     
-    def export_actions_to_csv(self, filename=None):
-        """Export actions to CSV format"""
-        if filename is None:
-            filename = f"actions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        actions = self.load_actions()
-        
-        if not actions:
-            print("⚠️  No actions to export")
+    splittable = True
+    
+    def __init__(self, filepath, kind, fieldnames, row=None, fragment=False):
+        self.filepath = filepath
+        self.kind = kind
+        self.fieldnames = fieldnames
+        self.row = row
+        self.fragment = fragment
+        self.count = 0
+    
+    def begin(self):
+        if self.stitched:
+            self.file = StitchedFile(self.filepath)
+        else:
+            self.file = open(self.filepath, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames, extrasaction='ignore')
+        if not self.fragment:
+            self.writer.writeheader()
+    
+    def add(self, kind, record):
+        if kind == self.kind:
+            self.writer.writerow(self.row(record) if self.row else record)
+            self.count += 1
+    
+    def finish(self, stats):
+        if self.fragment:
+            return self._close_part()
+        self.file.close()
+        if not self.count:
+            os.remove(self.filepath)
+            print(f"⚠️  No {self.kind} to export")
             return None
-        
-        fieldnames = ['timestamp', 'action', 'status', 'reason', 'message', 'ip']
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            
-            for action in actions:
-                # Flatten nested structures
-                row = {
-                    'timestamp': action.get('timestamp'),
-                    'action': action.get('action'),
-                    'status': action.get('status'),
-                    'reason': action.get('reason', action.get('message', '')),
-                    'message': action.get('message', ''),
-                    'ip': action.get('ip', '')
-                }
-                writer.writerow(row)
-        
-        print(f"✅ Exported {len(actions)} actions to {filepath}")
-        return filepath
+        print(f"✅ Exported {self.count} {self.kind} to {self.filepath}")
+        return self.filepath
     
-    def export_to_json(self, filename=None):
-        """Export complete data to JSON"""
-        if filename is None:
-            filename = f"complete_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        
-        data = {
-            'export_time': datetime.now().isoformat(),
-            'sessions': self.load_sessions(),
-            'actions': self.load_actions(),
-            'statistics': self._generate_stats()
+    def part(self, kind, index):
+        if kind != self.kind:
+            return None
+        return CsvSink(f"{self.filepath}.part{index}", kind, self.fieldnames, self.row, fragment=True)
+    
+    def join(self, kind, result):
+        filepath, count = result
+        self.file.append(filepath)
+        self.count += count
+
+class JsonSink(ExportSink):
+    """
+    Complete export as one JSON document, written as records arrive.
+    
+    Produces the same layout as json.dump(..., indent=2) of
+    {export_time, sessions, actions, statistics}, but each record is
+    serialized and written on its own, optionally through gzip.
+    """
+    
+    splittable = True
+    
+    def __init__(self, filepath, compress=False, fragment=False):
+        self.filepath = filepath
+        self.compress = compress
+        self.fragment = fragment
+        self.section = None
+        self.count = 0
+    
+    def begin(self):
+        self.file = _open_text(self.filepath, self.compress, self.stitched)
+        if not self.fragment:
+            self.file.write('{\n  "export_time": %s' % json.dumps(datetime.now().isoformat()))
+    
+    def add(self, kind, record):
+        if self.fragment:
+            # Records of one chunk only; join() adds the separator before it
+            if self.count:
+                self.file.write(',\n    ')
+        else:
+            if kind != self.section:
+                self._advance(kind)
+            self.file.write('[\n    ' if self.count == 0 else ',\n    ')
+        self.file.write(json.dumps(record, indent=2).replace('\n', '\n    '))
+        self.count += 1
+    
+    def finish(self, stats):
+        if self.fragment:
+            return self._close_part()
+        self._advance(None)
+        self.file.write(',\n  "statistics": %s\n}' % json.dumps(stats, indent=2).replace('\n', '\n  '))
+        self.file.close()
+        print(f"✅ Exported complete data to {self.filepath}")
+        return self.filepath
+    
+    def part(self, kind, index):
+        return JsonSink(f"{self.filepath}.part{index}", self.compress, fragment=True)
+    
+    def join(self, kind, result):
+        filepath, count = result
+        if kind != self.section:
+            self._advance(kind)
+        self.file.write('[\n    ' if self.count == 0 else ',\n    ')
+        self.file.append(filepath)
+        self.count += count
+    
+    def _advance(self, kind):
+        """Close the open array and open the next ones, up to kind (or all)"""
+        order = [name for name, _ in EXPORT_LOGS]
+        for name in order[0 if self.section is None else order.index(self.section) + 1:]:
+            self._close_section()
+            self.file.write(',\n  %s: ' % json.dumps(name))
+            self.section = name
+            self.count = 0
+            if name == kind:
+                return
+        self._close_section()
+        self.section = kind
+    
+    def _close_section(self):
+        if self.section is not None:
+            self.file.write('[]' if self.count == 0 else '\n  ]')
+
+class NdjsonSink(ExportSink):
+    """
+    Complete export as newline-delimited JSON.
+    
+    One object per line: an "export" header, then every session and
+    action as {"kind": ..., "record": ...}, then the "statistics" line.
+    Consumers can process it line by line without loading the whole file.
+    """
+    
+    splittable = True
+    
+    def __init__(self, filepath, compress=False, fragment=False):
+        self.filepath = filepath
+        self.compress = compress
+        self.fragment = fragment
+        self.count = 0
+    
+    def begin(self):
+        self.file = _open_text(self.filepath, self.compress, self.stitched)
+        if not self.fragment:
+            self._write('export', {'export_time': datetime.now().isoformat()})
+    
+    def add(self, kind, record):
+        self._write(kind, record)
+        self.count += 1
+    
+    def finish(self, stats):
+        if self.fragment:
+            return self._close_part()
+        self._write('statistics', stats)
+        self.file.close()
+        print(f"✅ Exported {self.count} records to {self.filepath}")
+        return self.filepath
+    
+    def part(self, kind, index):
+        return NdjsonSink(f"{self.filepath}.part{index}", self.compress, fragment=True)
+    
+    def join(self, kind, result):
+        filepath, count = result
+        self.file.append(filepath)
+        self.count += count
+    
+    def _write(self, kind, record):
+        self.file.write(json.dumps({'kind': kind, 'record': record}) + '\n')
+
+class ParquetSink(ExportSink):
+    """
+    Sessions and actions as two Parquet files (requires pyarrow).
+    
+    Rows are buffered per column and written as a row group every
+    PARQUET_ROW_GROUP records, so at most one row group is in memory.
+    Categorical strings are dictionary-encoded, timestamps are native
+    timestamp[us], header/args/form dicts are map<string, string>, and
+    any other fields are kept as a JSON string in 'extra'.
+    """
+    
+    def __init__(self, filepaths, row_group=PARQUET_ROW_GROUP):
+        if pa is None:
+            # Fail before any run starts rather than part-way through one
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+        self.filepaths = filepaths
+        self.row_group = row_group
+        self.writers = {}
+        self.buffers = {}
+        self.counts = {}
+    
+    def begin(self):
+        for kind, filepath in self.filepaths.items():
+            self.writers[kind] = pq.ParquetWriter(filepath, self._schema(kind), compression='snappy')
+            self.buffers[kind] = {name: [] for name in list(PARQUET_COLUMNS[kind]) + ['extra']}
+            self.counts[kind] = 0
+    
+    def add(self, kind, record):
+        if kind not in self.writers:
+            return
+        columns = PARQUET_COLUMNS[kind]
+        buffer = self.buffers[kind]
+        for name, column_type in columns.items():
+            value = record.get(name)
+            if column_type == 'timestamp':
+                value = _parse_timestamp(value)
+            elif column_type == 'map':
+                value = list(value.items()) if isinstance(value, dict) else None
+                if value:
+                    value = [(str(k), None if v is None else str(v)) for k, v in value]
+            elif value is not None and not isinstance(value, str):
+                value = str(value)
+            buffer[name].append(value)
+        extra = {k: v for k, v in record.items() if k not in columns}
+        buffer['extra'].append(json.dumps(extra) if extra else None)
+        self.counts[kind] += 1
+        if len(buffer['extra']) >= self.row_group:
+            self._flush(kind)
+    
+    def finish(self, stats):
+        for kind, writer in self.writers.items():
+            self._flush(kind)
+            writer.close()
+            print(f"✅ Exported {self.counts[kind]} {kind} to {self.filepaths[kind]}")
+        return list(self.filepaths.values())
+    
+    def _schema(self, kind):
+        types = {
+            'timestamp': pa.timestamp('us'),
+            'category': pa.dictionary(pa.int32(), pa.string()),
+            'string': pa.string(),
+            'map': pa.map_(pa.string(), pa.string()),
         }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        
-        print(f"✅ Exported complete data to {filepath}")
-        return filepath
+        fields = [pa.field(name, types[t]) for name, t in PARQUET_COLUMNS[kind].items()]
+        return pa.schema(fields + [pa.field('extra', pa.string())])
     
-    def export_summary_report(self, filename=None):
-        """Export a human-readable summary report"""
-        if filename is None:
-            filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        
-        filepath = os.path.join(self.output_dir, filename)
-        sessions = self.load_sessions()
-        actions = self.load_actions()
-        stats = self._generate_stats()
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
+    def _flush(self, kind):
+        buffer = self.buffers[kind]
+        if not buffer['extra']:
+            return
+        schema = self.writers[kind].schema
+        arrays = []
+        for field in schema:
+            if pa.types.is_dictionary(field.type):
+                array = pa.array(buffer[field.name], type=pa.string()).dictionary_encode()
+            else:
+                array = pa.array(buffer[field.name], type=field.type)
+            arrays.append(array)
+        self.writers[kind].write_table(pa.Table.from_arrays(arrays, schema=schema))
+        for values in buffer.values():
+            values.clear()
+
+def _parse_timestamp(value):
+    """ISO string -> naive datetime (UTC if it carried an offset), None if invalid"""
+    try:
+        dt = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+def _file_identity(path):
+    """[st_dev, st_ino, st_size] of a file, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_dev, st.st_ino, st.st_size]
+
+def _seek_time(f, target):
+    """
+    Move f to a line boundary before the first record stamped target or
+    later, by binary search over byte offsets (the log is appended in
+    roughly time order)
+    """
+    f.seek(0, os.SEEK_END)
+    lo, hi = 0, f.tell()
+    while hi - lo > SEEK_BLOCK:
+        mid = (lo + hi) // 2
+        timestamp = _timestamp_after(f, mid)
+        if timestamp is None or timestamp >= target:
+            hi = mid
+        else:
+            lo = mid
+    f.seek(lo)
+    if lo:
+        f.readline()
+
+def _timestamp_after(f, offset, max_lines=100):
+    """Timestamp of the first complete, stamped line after offset"""
+    f.seek(offset)
+    f.readline()
+    for _ in range(max_lines):
+        line = f.readline()
+        if not line:
+            return None
+        try:
+            timestamp = _parse_timestamp(json.loads(line).get('timestamp'))
+        except (ValueError, AttributeError):
+            continue
+        if timestamp is not None:
+            return timestamp
+    return None
+
+def _parse_time_arg(value):
+    """--since/--until value: ISO timestamp, or a duration ago such as 30m, 6h, 7d"""
+    match = re.fullmatch(r'(\d+)([smhd])', value.strip())
+    if match:
+        unit = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}[match.group(2)]
+        return datetime.now() - timedelta(**{unit: int(match.group(1))})
+    timestamp = _parse_timestamp(value)
+    if timestamp is None:
+        raise argparse.ArgumentTypeError(f"not a timestamp or duration: {value}")
+    return timestamp
+
+def _line_chunks(path, start=0, chunk_size=PARALLEL_CHUNK):
+    """[(start, end)] byte ranges covering a log from start, cut after newlines"""
+    if not os.path.exists(path):
+        return []
+    chunks = []
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+def _export_chunk(kind, path, start, end, parts, rollup, filters):
+    """Worker of run_parallel: export the records of one byte range"""
+    for part in parts:
+        if part is not None:
+            part.begin()
+    active = [part for part in parts if part is not None]
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        for line in f:
+            if remaining <= 0:
+                break
+            remaining -= len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if filters is not None and not filters.matches(kind, record, _parse_timestamp(record.get('timestamp'))):
+                continue
+            rollup.add(record)
+            for part in active:
+                part.add(kind, record)
+    return rollup, [None if part is None else part.finish(None) for part in parts]
+
+def _has_complete_line(path, start, chunk_size=65536):
+    """True if a newline-terminated line exists past byte offset start"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return False
+                if b'\n' in chunk:
+                    return True
+    except OSError:
+        return False
+
+class ReportSink(ExportSink):
+    """Human-readable summary report"""
+    
+    splittable = True
+    
+    def __init__(self, filepath, fragment=False):
+        self.filepath = filepath
+        self.fragment = fragment
+        self.critical = deque(maxlen=5)
+    
+    def add(self, kind, record):
+        if kind == 'sessions' and record.get('severity') == 'critical':
+            self.critical.append(record)
+    
+    def part(self, kind, index):
+        return ReportSink(None, fragment=True) if kind == 'sessions' else None
+    
+    def join(self, kind, result):
+        self.critical.extend(result)
+    
+    def finish(self, stats):
+        if self.fragment:
+            return list(self.critical)
+        with open(self.filepath, 'w', encoding='utf-8') as f:
             f.write("="*70 + "\n")
             f.write("NEUROHONEYPOT - SECURITY REPORT\n")
             f.write("="*70 + "\n\n")
@@ -142,7 +548,11 @@ class DataExporter:
             f.write("SUMMARY\n")
             f.write("-"*70 + "\n")
             f.write(f"Total Sessions: {stats['total_sessions']}\n")
-            f.write(f"Unique IPs: {stats['unique_ips']}\n")
+            error = stats['error_bounds']['unique_ips']
+            if error:
+                f.write(f"Unique IPs: ~{stats['unique_ips']} (±{error:.1%} standard error, HyperLogLog)\n")
+            else:
+                f.write(f"Unique IPs: {stats['unique_ips']}\n")
             f.write(f"Attack Attempts: {stats['attack_sessions']}\n")
             f.write(f"Actions Taken: {stats['total_actions']}\n\n")
             
@@ -162,6 +572,21 @@ class DataExporter:
             f.write("-"*70 + "\n")
             for ip, count in stats['top_ips'][:10]:
                 f.write(f"  {ip}: {count} requests\n")
+            self._write_bound(f, stats['error_bounds']['top_ips'])
+            f.write("\n")
+            
+            f.write("TOP REQUESTED PATHS\n")
+            f.write("-"*70 + "\n")
+            for path, count in stats['top_paths'][:10]:
+                f.write(f"  {path}: {count} requests\n")
+            self._write_bound(f, stats['error_bounds']['top_paths'])
+            f.write("\n")
+            
+            f.write("TOP USER AGENTS\n")
+            f.write("-"*70 + "\n")
+            for user_agent, count in stats['top_user_agents'][:10]:
+                f.write(f"  {user_agent or '(none)'}: {count} requests\n")
+            self._write_bound(f, stats['error_bounds']['top_user_agents'])
             f.write("\n")
             
             f.write("DEFENSIVE ACTIONS\n")
@@ -172,8 +597,7 @@ class DataExporter:
             
             f.write("RECENT CRITICAL EVENTS\n")
             f.write("-"*70 + "\n")
-            critical_sessions = [s for s in sessions if s.get('severity') == 'critical']
-            for session in critical_sessions[-5:]:
+            for session in self.critical:
                 f.write(f"  [{session.get('timestamp', '')}] ")
                 f.write(f"{session.get('ip', 'unknown')} - ")
                 f.write(f"{session.get('attack_type', 'unknown')}\n")
@@ -182,60 +606,440 @@ class DataExporter:
             f.write("End of Report\n")
             f.write("="*70 + "\n")
         
-        print(f"✅ Generated summary report: {filepath}")
-        return filepath
+        print(f"✅ Generated summary report: {self.filepath}")
+        return self.filepath
     
-    def _generate_stats(self):
-        """Generate statistics from data"""
-        sessions = self.load_sessions()
-        actions = self.load_actions()
+    def _write_bound(self, f, bound):
+        if bound:
+            f.write(f"  (approximate: counts may exceed the true count by up to {bound})\n")
+
+def _action_row(action):
+    """Flatten an action for CSV"""
+    return {
+        'timestamp': action.get('timestamp'),
+        'action': action.get('action'),
+        'status': action.get('status'),
+        'reason': action.get('reason', action.get('message', '')),
+        'message': action.get('message', ''),
+        'ip': action.get('ip', '')
+    }
+
+class RecordFilter:
+    """
+    Predicate applied while streaming an export.
+    
+    since/until bound the record timestamp and ips limit the IP on every
+    log; attack_types and severities only apply to sessions, since actions
+    carry neither.
+    """
+    
+    def __init__(self, since=None, until=None, ips=None, attack_types=None, severities=None):
+        self.since = since
+        self.until = until
+        self.ips = set(ips) if ips else None
+        self.attack_types = set(attack_types) if attack_types else None
+        self.severities = set(severities) if severities else None
+    
+    def matches(self, kind, record, timestamp):
+        if self.since is not None or self.until is not None:
+            if timestamp is None:
+                return False
+            if self.since is not None and timestamp < self.since:
+                return False
+            if self.until is not None and timestamp > self.until:
+                return False
+        if self.ips is not None and record.get('ip') not in self.ips:
+            return False
+        if kind == 'sessions':
+            if self.attack_types is not None and record.get('attack_type', 'normal') not in self.attack_types:
+                return False
+            if self.severities is not None and record.get('severity', 'low') not in self.severities:
+                return False
+        return True
+
+class DataExporter:
+    """Export honeypot data to various formats"""
+    
+    def __init__(self, filters=None, approximate=False, workers=1):
+        self.output_dir = 'exports'
+        self.filters = filters
+        self.approximate = approximate
+        self.workers = workers
+        os.makedirs(self.output_dir, exist_ok=True)
+    
+    def iter_jsonl(self, path):
+        """Yield records from a JSONL file one at a time"""
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            yield json.loads(line.strip())
+                        except:
+                            pass
+    
+    def load_sessions(self):
+        """Load all sessions from JSONL"""
+        return list(self.iter_jsonl('data/sessions.jsonl'))
+    
+    def load_actions(self):
+        """Load all actions from JSONL"""
+        return list(self.iter_jsonl('data/actions.jsonl'))
+    
+    def iter_filtered(self, kind, path):
+        """
+        Yield the records of one log that pass self.filters.
         
-        # Attack types
-        attack_types = {}
-        for session in sessions:
-            attack_type = session.get('attack_type', 'normal')
-            attack_types[attack_type] = attack_types.get(attack_type, 0) + 1
+        With --since the log is binary-searched by timestamp and reading
+        starts just before the first matching record; with --until it
+        stops once records are past the end of the window. Both allow
+        SEEK_SLACK of out-of-order timestamps, so the cost follows the
+        size of the window, not of the log.
+        """
+        filters = self.filters
+        if not os.path.exists(path):
+            return
+        stop = filters.until + SEEK_SLACK if filters.until is not None else None
+        with open(path, 'rb') as f:
+            if filters.since is not None:
+                _seek_time(f, filters.since - SEEK_SLACK)
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                timestamp = _parse_timestamp(record.get('timestamp'))
+                if stop is not None and timestamp is not None and timestamp > stop:
+                    break
+                if filters.matches(kind, record, timestamp):
+                    yield record
+    
+    def iter_jsonl_from(self, path, start, progress):
+        """
+        Yield records from complete lines after byte offset start.
         
-        # Severities
-        severities = {}
-        for session in sessions:
-            severity = session.get('severity', 'low')
-            severities[severity] = severities.get(severity, 0) + 1
+        progress['end'] follows the offset just past the last complete
+        line, and progress['first'] / progress['last'] the first and last
+        record timestamps. A partially written last line is left for the
+        next export.
+        """
+        progress['end'] = start
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                progress['end'] += len(line)
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    progress.setdefault('first', record.get('timestamp'))
+                    progress['last'] = record.get('timestamp')
+                    yield record
+    
+    def run(self, sinks, sources=None):
+        """
+        Stream every log once, feeding each record to the stats rollups
+        and to all sinks, then finish the sinks with the statistics.
+        sources optionally maps a log kind to its record iterable.
+        Returns the sinks' file paths.
+        """
+        if self.workers != 1 and sources is None:
+            if all(sink.splittable for sink in sinks):
+                return self.run_parallel(sinks)
+            print("⚠️  Parquet export cannot be split; exporting in one process")
+        rollups = self._new_rollups()
+        for sink in sinks:
+            sink.begin()
+        for kind, path in EXPORT_LOGS:
+            rollup = rollups[kind]
+            if sources is not None:
+                records = sources[kind]
+            elif self.filters is not None:
+                records = self.iter_filtered(kind, path)
+            else:
+                records = self.iter_jsonl(path)
+            for record in records:
+                rollup.add(record)
+                for sink in sinks:
+                    sink.add(kind, record)
+        stats = self._stats_from(rollups)
+        return [sink.finish(stats) for sink in sinks]
+    
+    def run_parallel(self, sinks):
+        """
+        run() across worker processes (self.workers, 0 = one per core).
         
-        # Top IPs
-        ip_counts = {}
-        for session in sessions:
-            ip = session.get('ip', 'unknown')
-            ip_counts[ip] = ip_counts.get(ip, 0) + 1
-        top_ips = sorted(ip_counts.items(), key=lambda x: x[1], reverse=True)
+        Each log is cut into PARALLEL_CHUNK byte ranges ending on line
+        boundaries. A worker parses one range, folds it into its own
+        rollup and writes a part file per sink; the main process merges
+        the rollups and splices the parts into the sinks' outputs in log
+        order, so the files match a single-process export.
+        """
+        rollups = self._new_rollups()
+        tasks = []
+        for kind, path in EXPORT_LOGS:
+            start = 0
+            if self.filters is not None and self.filters.since is not None and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    _seek_time(f, self.filters.since - SEEK_SLACK)
+                    start = f.tell()
+            for chunk_start, chunk_end in _line_chunks(path, start):
+                parts = [sink.part(kind, len(tasks)) for sink in sinks]
+                tasks.append((kind, path, chunk_start, chunk_end, parts))
         
-        # Action types
-        action_types = {}
-        for action in actions:
-            action_type = action.get('action', 'unknown')
-            action_types[action_type] = action_types.get(action_type, 0) + 1
+        for sink in sinks:
+            sink.stitched = True
+            sink.begin()
+        with ProcessPoolExecutor(max_workers=self.workers or None) as pool:
+            futures = [
+                (kind, pool.submit(_export_chunk, kind, path, start, end, parts,
+                                   self._new_rollup(kind), self.filters))
+                for kind, path, start, end, parts in tasks
+            ]
+            for kind, future in futures:
+                rollup, results = future.result()
+                rollups[kind].merge(rollup)
+                for sink, result in zip(sinks, results):
+                    if result is not None:
+                        sink.join(kind, result)
+        stats = self._stats_from(rollups)
+        return [sink.finish(stats) for sink in sinks]
+    
+    def sessions_csv_sink(self, filename=None):
+        return CsvSink(self._path(filename, 'sessions', 'csv'), 'sessions', SESSION_CSV_FIELDS)
+    
+    def actions_csv_sink(self, filename=None):
+        return CsvSink(self._path(filename, 'actions', 'csv'), 'actions', ACTION_CSV_FIELDS, _action_row)
+    
+    def json_sink(self, filename=None, compress=False):
+        return JsonSink(self._path(filename, 'complete_export', 'json', compress), compress)
+    
+    def ndjson_sink(self, filename=None, compress=False):
+        return NdjsonSink(self._path(filename, 'complete_export', 'ndjson', compress), compress)
+    
+    def parquet_sink(self):
+        return ParquetSink({
+            kind: self._path(None, kind, 'parquet') for kind, _ in EXPORT_LOGS
+        })
+    
+    def report_sink(self, filename=None):
+        return ReportSink(self._path(filename, 'report', 'txt'))
+    
+    def export_sessions_to_csv(self, filename=None):
+        """Export sessions to CSV format"""
+        return self.run([self.sessions_csv_sink(filename)])[0]
+    
+    def export_actions_to_csv(self, filename=None):
+        """Export actions to CSV format"""
+        return self.run([self.actions_csv_sink(filename)])[0]
+    
+    def export_to_json(self, filename=None, compress=False):
+        """Export complete data to JSON"""
+        return self.run([self.json_sink(filename, compress)])[0]
+    
+    def export_to_ndjson(self, filename=None, compress=False):
+        """Export complete data to newline-delimited JSON"""
+        return self.run([self.ndjson_sink(filename, compress)])[0]
+    
+    def export_to_parquet(self):
+        """Export sessions and actions to Parquet (needs pyarrow)"""
+        try:
+            sink = self.parquet_sink()
+        except ImportError as e:
+            print(f"❌ {e}")
+            return None
+        return self.run([sink])[0]
+    
+    def export_summary_report(self, filename=None):
+        """Export a human-readable summary report"""
+        return self.run([self.report_sink(filename)])[0]
+    
+    def export_delta(self, fmt='ndjson', compress=False):
+        """
+        Export only what was appended to the logs since the last delta.
+        
+        A checkpoint in the export directory records, per log, the file
+        identity and the byte offset already exported. If a log was
+        replaced or truncated it is exported again from the start and the
+        manifest entry marks it as reset. Each run appends an entry to
+        manifest.jsonl (sequence, files, per-log offsets, record counts and
+        timestamp range) so consumers can stitch deltas back together.
+        The checkpoint is saved first and carries the entry, so a crash
+        between the two is repaired on the next run instead of reusing
+        the sequence number.
+        """
+        checkpoint = self._load_delta_checkpoint()
+        self._recover_manifest(checkpoint)
+        plan = {}
+        for kind, path in EXPORT_LOGS:
+            identity = _file_identity(path)
+            previous = checkpoint.get('logs', {}).get(kind)
+            start, reset = 0, previous is not None
+            if identity and previous and previous['identity'] == identity[:2] and previous['offset'] <= identity[2]:
+                start, reset = previous['offset'], False
+            plan[kind] = {'path': path, 'identity': identity, 'start': start, 'reset': reset}
+        
+        if not any(p['reset'] or (p['identity'] and _has_complete_line(p['path'], p['start'])) for p in plan.values()):
+            print("✅ No new data since the last export")
+            return None
+        
+        sequence = checkpoint.get('sequence', 0) + 1
+        tag = f"delta_{sequence:06d}"
+        progress = {kind: {} for kind in plan}
+        sources = {kind: self.iter_jsonl_from(p['path'], p['start'], progress[kind]) for kind, p in plan.items()}
+        results = self.run(self._delta_sinks(fmt, compress, tag), sources)
+        
+        files = []
+        for result in results:
+            files.extend(result if isinstance(result, list) else [result] if result else [])
+        entry = {
+            'sequence': sequence,
+            'created': datetime.now().isoformat(),
+            'format': fmt,
+            'files': [os.path.basename(f) for f in files],
+            'logs': {
+                kind: {
+                    'reset': p['reset'],
+                    'start_offset': p['start'],
+                    'end_offset': progress[kind]['end'],
+                    'first_timestamp': progress[kind].get('first'),
+                    'last_timestamp': progress[kind].get('last')
+                }
+                for kind, p in plan.items()
+            }
+        }
+        self._save_delta_checkpoint({
+            'sequence': sequence,
+            'logs': {
+                kind: {'identity': p['identity'][:2], 'offset': progress[kind]['end']}
+                for kind, p in plan.items() if p['identity']
+            },
+            'entry': entry
+        })
+        self._append_manifest(entry)
+        print(f"✅ Delta export #{sequence} complete ({', '.join(entry['files']) or 'no new records'})")
+        return entry
+    
+    def _delta_sinks(self, fmt, compress, tag):
+        if fmt == 'csv':
+            return [self.sessions_csv_sink(f"sessions_{tag}.csv"), self.actions_csv_sink(f"actions_{tag}.csv")]
+        if fmt == 'json':
+            return [self.json_sink(f"export_{tag}.json" + ('.gz' if compress else ''), compress)]
+        if fmt == 'parquet':
+            return [ParquetSink({kind: os.path.join(self.output_dir, f"{kind}_{tag}.parquet") for kind, _ in EXPORT_LOGS})]
+        return [self.ndjson_sink(f"export_{tag}.ndjson" + ('.gz' if compress else ''), compress)]
+    
+    def _recover_manifest(self, checkpoint):
+        """Append the checkpoint's entry if the last run died before writing it"""
+        entry = checkpoint.get('entry')
+        if entry and self._last_manifest_sequence() < entry['sequence']:
+            self._append_manifest(entry)
+    
+    def _last_manifest_sequence(self):
+        path = os.path.join(self.output_dir, 'manifest.jsonl')
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - 65536, 0))
+                tail = f.read()
+        except OSError:
+            return 0
+        for line in reversed(tail.splitlines()):
+            try:
+                return json.loads(line)['sequence']
+            except (ValueError, KeyError, TypeError):
+                continue  # torn or partial line
+        return 0
+    
+    def _append_manifest(self, entry):
+        path = os.path.join(self.output_dir, 'manifest.jsonl')
+        with open(path, 'a+b') as f:
+            prefix = b''
+            if f.seek(0, os.SEEK_END):
+                # Start on a fresh line if a crash left a partial one behind
+                f.seek(-1, os.SEEK_END)
+                prefix = b'' if f.read(1) == b'\n' else b'\n'
+            f.write(prefix + (json.dumps(entry) + '\n').encode())
+    
+    def _load_delta_checkpoint(self):
+        path = os.path.join(self.output_dir, 'delta_checkpoint.json')
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {}
+    
+    def _save_delta_checkpoint(self, checkpoint):
+        path = os.path.join(self.output_dir, 'delta_checkpoint.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(path + '.tmp', path)
+    
+    def _generate_stats(self):
+        """Generate statistics from data"""
+        rollups = self._new_rollups()
+        for kind, path in EXPORT_LOGS:
+            rollups[kind].update(self.iter_jsonl(path))
+        return self._stats_from(rollups)
+    
+    def _new_rollups(self):
+        return {kind: self._new_rollup(kind) for kind, _ in EXPORT_LOGS}
+    
+    def _new_rollup(self, kind):
+        return EventRollup(ROLLUP_DIMENSIONS[kind], top_fields=TOP_K_FIELDS[kind],
+                           approximate=self.approximate)
+    
+    def _stats_from(self, rollups):
+        sessions = rollups['sessions']
+        session_summary = sessions.get_summary()
+        attack_types = session_summary['counts']['attack_type']
+        top = {field: sessions.get_top(field, None) for field in ('ip', 'path', 'user_agent')}
         
         return {
-            'total_sessions': len(sessions),
-            'unique_ips': len(set(s.get('ip') for s in sessions)),
-            'attack_sessions': len([s for s in sessions if s.get('attack_type') != 'normal']),
-            'total_actions': len(actions),
+            'total_sessions': session_summary['total'],
+            'unique_ips': session_summary['unique_ips'],
+            'attack_sessions': session_summary['total'] - attack_types.get('normal', 0),
+            'total_actions': rollups['actions'].total,
             'attack_types': attack_types,
-            'severities': severities,
-            'top_ips': top_ips,
-            'action_types': action_types
+            'severities': session_summary['counts']['severity'],
+            'top_ips': [(ip, count) for ip, count, _ in top['ip']],
+            'top_paths': [(path, count) for path, count, _ in top['path']],
+            'top_user_agents': [(agent, count) for agent, count, _ in top['user_agent']],
+            'action_types': rollups['actions'].get_counts('action'),
+            'error_bounds': {
+                'unique_ips': session_summary['unique_ips_error'],
+                'top_ips': max((error for _, _, error in top['ip']), default=0),
+                'top_paths': max((error for _, _, error in top['path']), default=0),
+                'top_user_agents': max((error for _, _, error in top['user_agent']), default=0)
+            }
         }
     
+    def _path(self, filename, prefix, extension, compress=False):
+        if filename is None:
+            filename = f"{prefix}_{_stamp()}.{extension}" + ('.gz' if compress else '')
+        return os.path.join(self.output_dir, filename)
+    
     def export_all(self):
-        """Export everything in all formats"""
+        """Export everything in all formats, in one pass over the logs"""
         print("\n" + "="*60)
         print("📦 Exporting All Data")
         print("="*60 + "\n")
         
-        self.export_sessions_to_csv()
-        self.export_actions_to_csv()
-        self.export_to_json()
-        self.export_summary_report()
+        self.run([
+            self.sessions_csv_sink(),
+            self.actions_csv_sink(),
+            self.json_sink(),
+            self.report_sink()
+        ])
         
         print("\n" + "="*60)
         print(f"✅ All exports complete! Check the '{self.output_dir}' directory")
@@ -243,23 +1047,47 @@ class DataExporter:
 
 def main():
     """Main entry point"""
-    exporter = DataExporter()
+    parser = argparse.ArgumentParser(description="Export NeuroHoneypot sessions and actions")
+    parser.add_argument('export_type', nargs='?', default='all',
+                        choices=['csv', 'json', 'ndjson', 'parquet', 'report', 'all', 'delta'])
+    parser.add_argument('delta_format', nargs='?', default='ndjson', choices=DELTA_FORMATS,
+                        help="output format for delta exports")
+    parser.add_argument('--gzip', action='store_true', help="compress json/ndjson output")
+    parser.add_argument('--since', type=_parse_time_arg, help="ISO timestamp or duration ago (30m, 6h, 7d)")
+    parser.add_argument('--until', type=_parse_time_arg, help="ISO timestamp or duration ago")
+    parser.add_argument('--ip', action='append', help="only this IP (repeatable)")
+    parser.add_argument('--attack-type', action='append', help="only sessions of this attack type (repeatable)")
+    parser.add_argument('--severity', action='append', help="only sessions of this severity (repeatable)")
+    parser.add_argument('--approximate', action='store_true',
+                        help="fixed-memory statistics (HyperLogLog, Count-Min) for very large logs")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for a chunked parallel export (0 = one per core)")
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1:
-        export_type = sys.argv[1].lower()
-        
-        if export_type == 'csv':
-            exporter.export_sessions_to_csv()
-            exporter.export_actions_to_csv()
-        elif export_type == 'json':
-            exporter.export_to_json()
-        elif export_type == 'report':
-            exporter.export_summary_report()
-        elif export_type == 'all':
-            exporter.export_all()
+    filters = None
+    if args.since or args.until or args.ip or args.attack_type or args.severity:
+        if args.export_type == 'delta':
+            parser.error("filters cannot be combined with delta exports")
+        filters = RecordFilter(args.since, args.until, args.ip, args.attack_type, args.severity)
+    if args.workers != 1 and args.export_type == 'delta':
+        parser.error("delta exports run in one process")
+    exporter = DataExporter(filters, args.approximate, args.workers)
+    
+    if args.export_type == 'csv':
+        exporter.run([exporter.sessions_csv_sink(), exporter.actions_csv_sink()])
+    elif args.export_type == 'json':
+        exporter.export_to_json(compress=args.gzip)
+    elif args.export_type == 'ndjson':
+        exporter.export_to_ndjson(compress=args.gzip)
+    elif args.export_type == 'parquet':
+        exporter.export_to_parquet()
+    elif args.export_type == 'delta':
+        if args.delta_format == 'parquet' and pa is None:
+            print("❌ Parquet export needs pyarrow: pip install pyarrow")
         else:
-            print(f"Unknown export type: {export_type}")
-            print("Usage: python export_data.py [csv|json|report|all]")
+            exporter.export_delta(args.delta_format, args.gzip)
+    elif args.export_type == 'report':
+        exporter.export_summary_report()
     else:
         # Default: export everything
         exporter.export_all()
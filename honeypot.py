@@ -7,9 +7,16 @@ import json
 import os
 from datetime import datetime
 import hashlib
+import ipaddress
 
 app = Flask(__name__)
 
+# Peers whose forwarded-for header is believed: a reverse proxy on this
+# host, or sim_attacker.py --source-ips run locally. Anyone else is logged
+# by their socket address, so remote attackers cannot choose their IP.
+TRUSTED_PROXIES = {'127.0.0.1', '::1'}
+FORWARDED_HEADER = 'X-Forwarded-For'
+
 # Ensure data directory exists
 os.makedirs('data', exist_ok=True)
 
@@ -18,10 +25,28 @@ def log_session(data):
     with open('data/sessions.jsonl', 'a') as f:
         f.write(json.dumps(data) + '\n')
 
+def get_client_ip():
+    """Client IP, taken from FORWARDED_HEADER when the peer is a trusted proxy"""
+    ip = request.remote_addr
+    if ip in TRUSTED_PROXIES:
+        # Walk the chain from the right; the first hop that is not one of
+        # our proxies is the client
+        for hop in reversed(request.headers.get(FORWARDED_HEADER, '').split(',')):
+            hop = hop.strip()
+            try:
+                ipaddress.ip_address(hop)
+            except ValueError:
+                break
+            ip = hop
+            if hop not in TRUSTED_PROXIES:
+                break
+    return ip
+
 def get_client_info():
     """Extract client information from request"""
+    ip = get_client_ip()
     return {
-        'ip': request.remote_addr,
+        'ip': ip,
         'user_agent': request.headers.get('User-Agent', ''),
         'timestamp': datetime.now().isoformat(),
         'method': request.method,
@@ -29,7 +54,7 @@ def get_client_info():
         'args': dict(request.args),
         'form': dict(request.form),
         'headers': dict(request.headers),
-        'session_id': hashlib.md5(f"{request.remote_addr}{request.headers.get('User-Agent', '')}".encode()).hexdigest()[:16]
+        'session_id': hashlib.md5(f"{ip}{request.headers.get('User-Agent', '')}".encode()).hexdigest()[:16]
     }
 
 # HTML Templates
@@ -0,0 +1,171 @@
+"""
+NeuroHoneypot - Incremental Log Readers
+Tail append-only JSONL logs so repeated loads only parse new data
+"""
+import json
+import os
+import threading
+import time
+
+WATCH_INTERVAL = 0.5           # seconds between stat checks in ChangeWatcher
+
+class JsonlTail:
+    """
+    Incrementally parsed view of an append-only JSONL file.
+    
+    poll() reads only the bytes appended since the previous poll and parses
+    complete lines; a partially written last line is left for the next poll.
+    If the file is deleted, replaced (different identity) or truncated, the
+    parsed records are dropped and the file is read again from the start.
+    Safe to share between threads (e.g. Streamlit sessions). Listeners
+    registered with add_listener see every batch of new records exactly
+    once, in order, whichever thread polled, together with the byte offset
+    each record starts at. With retain=False the records are only handed
+    to listeners, not kept in self.records.
+    """
+    
+    HEAD_BYTES = 256
+    
+    def __init__(self, path, retain=True):
+        self.path = path
+        self.retain = retain
+        self.lock = threading.Lock()
+        self.records = []
+        self.offset = 0
+        self.identity = None
+        self.head = b''
+        self.generation = 0
+        self.listeners = []
+        self.pending_reset = False
+    
+    def add_listener(self, listener):
+        """Call listener(new_records, reset, offsets) on every poll that finds data"""
+        with self.lock:
+            self.listeners.append(listener)
+            if self.offset:
+                # Bring the new listener up to date: re-read the file on
+                # the next poll, which tells every listener to reset
+                self._reset(self.identity)
+                self.pending_reset = True
+    
+    def poll(self):
+        """
+        Parse whatever has been appended since the last call.
+        
+        Returns (new_records, reset) where reset is True if earlier records
+        were discarded because the file was removed, rotated or truncated.
+        """
+        with self.lock:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                reset = self.offset > 0 or bool(self.records)
+                if reset:
+                    self._reset(None)
+                    self._notify([], reset, [])
+                return [], reset
+            
+            identity = (st.st_dev, st.st_ino)
+            reset = False
+            if identity != self.identity or st.st_size < self.offset or not self._same_head():
+                reset = self.offset > 0 or bool(self.records)
+                self._reset(identity)
+            if self.pending_reset:
+                reset = True
+                self.pending_reset = False
+            
+            if st.st_size == self.offset:
+                if reset:
+                    self._notify([], reset, [])
+                return [], reset
+            
+            with open(self.path, 'rb') as f:
+                if self.offset == 0:
+                    self.head = f.read(self.HEAD_BYTES)
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+            
+            end = data.rfind(b'\n') + 1
+            new_records = []
+            offsets = []
+            position = self.offset
+            for line in data[:end].split(b'\n')[:-1]:
+                if line.strip():
+                    try:
+                        new_records.append(json.loads(line))
+                        offsets.append(position)
+                    except ValueError:
+                        pass
+                position += len(line) + 1
+            self.offset += end
+            if self.retain:
+                self.records.extend(new_records)
+            if new_records or reset:
+                self._notify(new_records, reset, offsets)
+            return new_records, reset
+    
+    def _notify(self, new_records, reset, offsets):
+        for listener in self.listeners:
+            listener(new_records, reset, offsets)
+    
+    def _same_head(self):
+        """Guard against a replaced file that happens to reuse the inode"""
+        if not self.head:
+            return True
+        try:
+            with open(self.path, 'rb') as f:
+                return f.read(len(self.head)) == self.head
+        except OSError:
+            return False
+    
+    def _reset(self, identity):
+        self.records = []
+        self.offset = 0
+        self.head = b''
+        self.identity = identity
+        self.generation += 1
+
+def file_signature(path):
+    """(mtime_ns, size) for cache keys, or None if the file does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+class ChangeWatcher:
+    """
+    Background thread that notices when watched files change.
+    
+    Every interval it stats each path and compares (mtime, size); when
+    any differ it bumps a single version. Readers compare versions instead
+    of re-reading files, so an idle consumer costs a few stat calls per
+    interval in one shared thread.
+    """
+    
+    def __init__(self, paths, interval=WATCH_INTERVAL):
+        self.paths = list(paths)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.version = 0
+        self.signatures = {path: file_signature(path) for path in self.paths}
+        self.thread = threading.Thread(target=self._run, daemon=True, name='change-watcher')
+        self.thread.start()
+    
+    def get_version(self):
+        """Bumped whenever any watched file changes"""
+        with self.lock:
+            return self.version
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            changed = False
+            for path in self.paths:
+                signature = file_signature(path)
+                if signature != self.signatures[path]:
+                    self.signatures[path] = signature
+                    changed = True
+            if changed:
+                with self.lock:
+                    self.version += 1
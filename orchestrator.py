@@ -3,9 +3,18 @@ NeuroHoneypot - Orchestrator API
 Executes defensive actions and logs them
 """
 from flask import Flask, request, jsonify
+import asyncio
+import atexit
+import heapq
 import json
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
 from datetime import datetime
+from enforcement import EnforcementManager, create_backend, validate_target
 
 app = Flask(__name__)
 
@@ -15,22 +24,544 @@ os.makedirs('data', exist_ok=True)
 # In-memory state
 blocked_ips = set()
 rate_limited_ips = {}
-deployed_decoys = []
+
+# State versioning for /state/changes delta sync
+CHANGE_LOG_SIZE = 1000
+# Random per run: versions and stream cursors only compare within one epoch,
+# since both counters restart from zero with the orchestrator
+STATE_EPOCH = os.urandom(4).hex()
+state_lock = threading.RLock()
+state_version = 0
+change_log = deque(maxlen=CHANGE_LOG_SIZE)
+
+def record_change(op, kind, key, value=None):
+    """Bump the state version and remember the mutation in the change log"""
+    global state_version
+    with state_lock:
+        state_version += 1
+        change_log.append({
+            'version': state_version,
+            'op': op,
+            'kind': kind,
+            'key': key,
+            'value': value
+        })
+        return state_version
+
+# Decoy lifecycle limits
+DECOY_MAX_TOTAL = 1000     # decoys kept across all targets
+DECOY_MAX_PER_IP = 5       # decoys kept per target IP
+DECOY_TTL = 3600           # seconds a decoy lives without being redeployed (None = forever)
+
+class DecoyManager:
+    """
+    Deployed decoys keyed by (target_ip, type).
+    
+    Redeploying the same decoy refreshes it instead of adding a duplicate.
+    Global and per-IP caps evict the least recently deployed decoy, and
+    expired decoys are purged lazily from a heap of expiry times. Indexes by
+    target IP and by type make lookups O(1). Not thread-safe on its own;
+    the orchestrator calls it under state_lock.
+    """
+    
+    def __init__(self, max_total=DECOY_MAX_TOTAL, max_per_ip=DECOY_MAX_PER_IP,
+                 ttl=DECOY_TTL, on_change=None):
+        self.max_total = max_total
+        self.max_per_ip = max_per_ip
+        self.ttl = ttl
+        self.on_change = on_change
+        self.decoys = OrderedDict()        # (target_ip, type) -> decoy, LRU order
+        self.by_ip = defaultdict(OrderedDict)
+        self.by_type = defaultdict(dict)
+        self.expiry_heap = []
+        self.next_id = 1
+    
+    def __len__(self):
+        return len(self.decoys)
+    
+    def deploy(self, target_ip, decoy_type, config=None, ttl=None):
+        """
+        Deploy or refresh a decoy.
+        
+        Returns (decoy, created) where created is False for a redeploy.
+        """
+        now = time.time()
+        self.purge_expired(now)
+        key = (target_ip, decoy_type)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        
+        decoy = self.decoys.get(key)
+        created = decoy is None
+        if created:
+            decoy = {
+                'id': f"decoy_{self.next_id}",
+                'type': decoy_type,
+                'target_ip': target_ip,
+                'config': config or {},
+                'deployed_at': datetime.now().isoformat(),
+                'deploy_count': 1
+            }
+            self.next_id += 1
+            self.decoys[key] = decoy
+            self.by_ip[target_ip][key] = decoy
+            self.by_type[decoy_type][key] = decoy
+        else:
+            decoy['config'] = config or decoy['config']
+            decoy['deploy_count'] += 1
+            decoy['last_deployed_at'] = datetime.now().isoformat()
+            self.decoys.move_to_end(key)
+            self.by_ip[target_ip].move_to_end(key)
+        
+        decoy['expires_at'] = expires_at
+        if expires_at is not None:
+            heapq.heappush(self.expiry_heap, (expires_at, decoy['id'], key))
+            if len(self.expiry_heap) > 4 * len(self.decoys) + 64:
+                self._compact_heap()
+        self._changed('add' if created else 'update', decoy)
+        
+        # Enforce caps, oldest first
+        while len(self.by_ip[target_ip]) > self.max_per_ip:
+            self._remove(next(iter(self.by_ip[target_ip])), 'evicted')
+        while len(self.decoys) > self.max_total:
+            self._remove(next(iter(self.decoys)), 'evicted')
+        
+        return decoy, created
+    
+    def for_ip(self, target_ip):
+        """Decoys aimed at one IP"""
+        self.purge_expired()
+        return list(self.by_ip.get(target_ip, {}).values())
+    
+    def for_type(self, decoy_type):
+        """Decoys of one type"""
+        self.purge_expired()
+        return list(self.by_type.get(decoy_type, {}).values())
+    
+    def get(self, target_ip, decoy_type):
+        """Single decoy by key, or None"""
+        self.purge_expired()
+        return self.decoys.get((target_ip, decoy_type))
+    
+    def all(self):
+        """Every live decoy, least recently deployed first"""
+        self.purge_expired()
+        return list(self.decoys.values())
+    
+    def purge_expired(self, now=None):
+        """Drop decoys whose TTL has passed"""
+        now = time.time() if now is None else now
+        while self.expiry_heap and self.expiry_heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self.expiry_heap)
+            decoy = self.decoys.get(key)
+            # Skip heap entries superseded by a redeploy
+            if decoy is not None and decoy['expires_at'] == expires_at:
+                self._remove(key, 'expired')
+    
+    def _compact_heap(self):
+        # Redeploys leave stale heap entries behind; rebuild from live decoys
+        self.expiry_heap = [
+            (d['expires_at'], d['id'], key)
+            for key, d in self.decoys.items() if d['expires_at'] is not None
+        ]
+        heapq.heapify(self.expiry_heap)
+    
+    def _remove(self, key, reason):
+        decoy = self.decoys.pop(key)
+        target_ip, decoy_type = key
+        del self.by_ip[target_ip][key]
+        if not self.by_ip[target_ip]:
+            del self.by_ip[target_ip]
+        del self.by_type[decoy_type][key]
+        if not self.by_type[decoy_type]:
+            del self.by_type[decoy_type]
+        decoy['removed'] = reason
+        self._changed('remove', decoy)
+    
+    def _changed(self, op, decoy):
+        if self.on_change:
+            self.on_change(op, 'decoy', decoy['id'], dict(decoy))
+
+decoy_manager = DecoyManager(on_change=record_change)
+
+def state_snapshot():
+    """Full copy of the current state, tagged with its version"""
+    with state_lock:
+        return {
+            'epoch': STATE_EPOCH,
+            'version': state_version,
+            'blocked_ips': list(blocked_ips),
+            'rate_limited_ips': dict(rate_limited_ips),
+            'deployed_decoys': decoy_manager.all(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+# Live action stream for /actions/stream
+STREAM_PORT = 5002
+STREAM_BACKLOG = 500       # actions kept for resume-from-cursor
+STREAM_BUFFER = 200        # pending actions per subscriber before it is dropped
+STREAM_KEEPALIVE = 15      # seconds between keep-alive comments
+
+class StreamSubscriber:
+    """Bounded queue of pending actions for one stream client"""
+    
+    def __init__(self, limit):
+        self.events = deque()
+        self.limit = limit
+        self.dropped = False
+    
+    def push(self, event):
+        """Queue an event; returns False once the client has fallen too far behind"""
+        if len(self.events) >= self.limit:
+            self.dropped = True
+            return False
+        self.events.append(event)
+        return True
+    
+    def drain(self):
+        """Take every pending event"""
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+class ActionBroadcaster:
+    """
+    Fan out logged actions to stream subscribers.
+    
+    publish() never blocks on a client: each subscriber has a bounded queue
+    and is dropped when it overflows. Recent actions are kept in a backlog
+    so reconnecting clients can resume from their last sequence number.
+    """
+    
+    def __init__(self, backlog=STREAM_BACKLOG, buffer_size=STREAM_BUFFER):
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.seq = 0
+        self.backlog = deque(maxlen=backlog)
+        self.buffer_size = buffer_size
+        self.subscribers = set()
+        self.listeners = []
+        self.dropped = 0
+    
+    def publish(self, action_data):
+        """Assign a sequence number to an action and push it to every subscriber"""
+        with self.lock:
+            self.seq += 1
+            event = (self.seq, json.dumps(action_data))
+            self.backlog.append(event)
+            for subscriber in list(self.subscribers):
+                if not subscriber.push(event):
+                    self.subscribers.discard(subscriber)
+                    self.dropped += 1
+            self.condition.notify_all()
+            listeners = list(self.listeners)
+        
+        for listener in listeners:
+            listener()
+        return event[0]
+    
+    def subscribe(self, cursor=None):
+        """
+        Register a subscriber.
+        
+        Returns (subscriber, gap). With a cursor, backlog entries after it are
+        queued first; gap is True when the cursor is older than the backlog
+        (or from a previous orchestrator run) and some actions were missed.
+        """
+        subscriber = StreamSubscriber(self.buffer_size)
+        gap = False
+        with self.lock:
+            if cursor is not None:
+                oldest = self.backlog[0][0] if self.backlog else self.seq + 1
+                gap = cursor < oldest - 1 or cursor > self.seq
+                start = 0 if gap else cursor - oldest + 1
+                subscriber.events.extend(islice(self.backlog, max(start, 0), None))
+                subscriber.limit = self.buffer_size + len(subscriber.events)
+            self.subscribers.add(subscriber)
+        return subscriber, gap
+    
+    def unsubscribe(self, subscriber):
+        """Remove a subscriber"""
+        with self.lock:
+            self.subscribers.discard(subscriber)
+    
+    def add_listener(self, callback):
+        """Call back (outside the lock) whenever an action is published"""
+        with self.lock:
+            self.listeners.append(callback)
+
+def format_stream_event(event, fmt='sse'):
+    """Render a (seq, payload) event as an SSE message or an NDJSON line"""
+    seq, payload = event
+    if fmt == 'ndjson':
+        return f'{{"seq": {seq}, "cursor": "{STATE_EPOCH}-{seq}", "action": {payload}}}\n'
+    return f"id: {STATE_EPOCH}-{seq}\nevent: action\ndata: {payload}\n\n"
+
+def format_stream_notice(name, data, fmt='sse'):
+    """Render a control message (gap, dropped) for the stream"""
+    if fmt == 'ndjson':
+        return json.dumps({'event': name, **data}) + '\n'
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+def parse_stream_cursor(value):
+    """
+    Parse a ?cursor= / Last-Event-ID value ('<epoch>-<seq>'). A cursor from
+    another orchestrator run, or without an epoch, becomes -1, which
+    subscribe() reports as a gap and answers with the whole backlog.
+    """
+    if value in (None, ''):
+        return None
+    epoch, _, seq = value.rpartition('-')
+    try:
+        seq = int(seq)
+    except ValueError:
+        return None
+    return seq if epoch == STATE_EPOCH else -1
+
+action_stream = ActionBroadcaster()
+
+class ActionStreamServer:
+    """
+    Asyncio HTTP server for /actions/stream.
+    
+    All subscribers share one event loop thread, so hundreds of concurrent
+    clients cost one socket each rather than one thread each.
+    """
+    
+    def __init__(self, broadcaster, host='0.0.0.0', port=STREAM_PORT):
+        self.broadcaster = broadcaster
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.wakeups = set()
+    
+    def start(self):
+        """Run the server on a background daemon thread"""
+        ready = threading.Event()
+        thread = threading.Thread(target=self._run, args=(ready,), daemon=True)
+        thread.start()
+        ready.wait(5)
+        return thread
+    
+    def _run(self, ready):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.broadcaster.add_listener(self._notify)
+        ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            server.close()
+    
+    def _notify(self):
+        # Called from whichever thread logged the action
+        self.loop.call_soon_threadsafe(self._wake_all)
+    
+    def _wake_all(self):
+        for wakeup in self.wakeups:
+            wakeup.set()
+    
+    async def _handle(self, reader, writer):
+        subscriber = None
+        wakeup = asyncio.Event()
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            
+            if len(request_line) < 2 or request_line[0] != 'GET':
+                writer.write(b"HTTP/1.1 405 Method Not Allowed\r\nConnection: close\r\n\r\n")
+                return
+            path, _, query = request_line[1].partition('?')
+            if path != '/actions/stream':
+                writer.write(b"HTTP/1.1 404 Not Found\r\nConnection: close\r\n\r\n")
+                return
+            
+            params = dict(p.partition('=')[::2] for p in query.split('&') if p)
+            fmt = 'ndjson' if params.get('format') == 'ndjson' else 'sse'
+            raw_cursor = params.get('cursor', headers.get('last-event-id'))
+            cursor = parse_stream_cursor(raw_cursor)
+            content_type = 'application/x-ndjson' if fmt == 'ndjson' else 'text/event-stream'
+            writer.write((
+                "HTTP/1.1 200 OK\r\n"
+                f"Content-Type: {content_type}\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Access-Control-Allow-Origin: *\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode())
+            
+            subscriber, gap = self.broadcaster.subscribe(cursor)
+            self.wakeups.add(wakeup)
+            if gap:
+                writer.write(format_stream_notice('gap', {'cursor': raw_cursor}, fmt).encode())
+            
+            while True:
+                chunks = [format_stream_event(e, fmt) for e in subscriber.drain()]
+                if subscriber.dropped:
+                    chunks.append(format_stream_notice('dropped', {'reason': 'client too slow'}, fmt))
+                if chunks:
+                    writer.write(''.join(chunks).encode())
+                    await writer.drain()
+                if subscriber.dropped:
+                    break
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    if fmt == 'sse':
+                        writer.write(b": keep-alive\n\n")
+                        await writer.drain()
+                wakeup.clear()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.wakeups.discard(wakeup)
+            if subscriber is not None:
+                self.broadcaster.unsubscribe(subscriber)
+            writer.close()
+
+# Action log writer
+ACTION_LOG_FILE = 'data/actions.jsonl'
+ACTION_LOG_DURABILITY = 'interval'   # 'none', 'interval' or 'batch'
+ACTION_LOG_FSYNC_INTERVAL = 1.0      # seconds between fsyncs in 'interval' mode
+ACTION_LOG_QUEUE_SIZE = 10000        # queued actions before callers are made to wait
+ACTION_LOG_MAX_BATCH = 1000          # actions written per group commit
+
+class ActionLogWriter:
+    """
+    Append actions to a JSONL file from a dedicated writer thread.
+    
+    Callers only serialize and enqueue; the writer drains whatever has
+    queued up and commits it with a single write. Durability modes:
+      none     - leave flushing to the OS
+      interval - fsync at most every fsync_interval seconds
+      batch    - fsync after every group commit
+    The queue is bounded, so when the disk falls behind, callers block
+    instead of growing memory without limit. The file is reopened for each
+    batch rather than held open, so it can be deleted (Clear Data) while the
+    orchestrator runs and is recreated by the next write.
+    """
+    
+    DURABILITY_MODES = ('none', 'interval', 'batch')
+    
+    def __init__(self, path=ACTION_LOG_FILE, durability=ACTION_LOG_DURABILITY,
+                 fsync_interval=ACTION_LOG_FSYNC_INTERVAL,
+                 queue_size=ACTION_LOG_QUEUE_SIZE, max_batch=ACTION_LOG_MAX_BATCH):
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.path = path
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self.max_batch = max_batch
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = {'written': 0, 'batches': 0, 'fsyncs': 0, 'stalls': 0, 'max_batch': 0}
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def write(self, action_data):
+        """Queue an action for the log, waiting if the writer is backed up"""
+        line = json.dumps(action_data) + '\n'
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            self.stats['stalls'] += 1
+            self.queue.put(line)
+    
+    def flush(self, sync=False, timeout=5):
+        """Wait until everything queued so far has been written (and fsynced if sync)"""
+        done = threading.Event()
+        self.queue.put((done, sync))
+        return done.wait(timeout)
+    
+    def close(self):
+        """Flush and fsync pending actions; used at interpreter exit"""
+        if self.thread.is_alive():
+            self.flush(sync=self.durability != 'none')
+    
+    def get_stats(self):
+        """Writer counters plus current queue depth"""
+        return {**self.stats, 'queued': self.queue.qsize(), 'durability': self.durability}
+    
+    def _run(self):
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                item = self.queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                item = None
+            
+            batch = [item] if item is not None else []
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            lines = [i for i in batch if isinstance(i, str)]
+            waiters = [i for i in batch if not isinstance(i, str)]
+            try:
+                now = time.monotonic()
+                sync = self.durability == 'batch' or any(s for _, s in waiters) or (
+                    self.durability == 'interval' and now - last_sync >= self.fsync_interval
+                )
+                if not lines and dirty and not os.path.exists(self.path):
+                    # Deleted since the last write; nothing left to sync
+                    dirty = False
+                if lines or (dirty and sync):
+                    with open(self.path, 'a') as f:
+                        if lines:
+                            f.write(''.join(lines))
+                            f.flush()
+                            dirty = True
+                            self.stats['written'] += len(lines)
+                            self.stats['batches'] += 1
+                            self.stats['max_batch'] = max(self.stats['max_batch'], len(lines))
+                        if dirty and sync:
+                            os.fsync(f.fileno())
+                            self.stats['fsyncs'] += 1
+                            dirty = False
+                            last_sync = now
+            except OSError as e:
+                print(f"❌ Action log write failed: {e}")
+            finally:
+                for done, _ in waiters:
+                    done.set()
+
+action_writer = ActionLogWriter()
+atexit.register(action_writer.close)
+
+# Enforcement backends that receive blocks and rate limits
+# (any of: nftables, ipset, proxy - see enforcement.py)
+ENFORCEMENT_BACKENDS = ['nftables']
+enforcement = EnforcementManager([create_backend(name) for name in ENFORCEMENT_BACKENDS])
 
 def log_action(action_data):
-    """Log action to JSONL file"""
-    with open('data/actions.jsonl', 'a') as f:
-        f.write(json.dumps(action_data) + '\n')
+    """Queue action for the JSONL log and push it to stream subscribers"""
+    action_writer.write(action_data)
+    action_stream.publish(action_data)
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
+    with state_lock:
+        decoy_manager.purge_expired()
+        active_decoys = len(decoy_manager)
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'blocked_ips': len(blocked_ips),
         'rate_limited': len(rate_limited_ips),
-        'active_decoys': len(deployed_decoys)
+        'active_decoys': active_decoys,
+        'action_log': action_writer.get_stats()
     })
 
 @app.route('/action/block_ip', methods=['POST'])
@@ -42,8 +573,16 @@ def block_ip():
     
     if not ip:
         return jsonify({'error': 'IP address required'}), 400
+    try:
+        ip, _ = validate_target('block', ip)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    blocked_ips.add(ip)
+    with state_lock:
+        if ip not in blocked_ips:
+            blocked_ips.add(ip)
+            record_change('add', 'blocked_ip', ip)
+    enforcement.submit('block', ip)
     
     action_log = {
         'timestamp': datetime.now().isoformat(),
@@ -71,12 +610,19 @@ def rate_limit():
     
     if not ip:
         return jsonify({'error': 'IP address required'}), 400
+    try:
+        ip, limit = validate_target('rate_limit', ip, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    rate_limited_ips[ip] = {
-        'limit': limit,
-        'reason': reason,
-        'applied_at': datetime.now().isoformat()
-    }
+    with state_lock:
+        rate_limited_ips[ip] = {
+            'limit': limit,
+            'reason': reason,
+            'applied_at': datetime.now().isoformat()
+        }
+        record_change('set', 'rate_limit', ip, rate_limited_ips[ip])
+    enforcement.submit('rate_limit', ip, limit)
     
     action_log = {
         'timestamp': datetime.now().isoformat(),
@@ -102,21 +648,21 @@ def deploy_decoy():
     decoy_type = data.get('type', 'generic')
     target_ip = data.get('target_ip', 'any')
     config = data.get('config', {})
+    ttl = data.get('ttl')
     
-    decoy = {
-        'id': f"decoy_{len(deployed_decoys) + 1}",
-        'type': decoy_type,
-        'target_ip': target_ip,
-        'config': config,
-        'deployed_at': datetime.now().isoformat()
-    }
+    # Seconds as a positive number; null/absent falls back to DECOY_TTL
+    if ttl is not None and (isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or not ttl > 0):
+        return jsonify({'error': 'ttl must be a positive number of seconds or null'}), 400
     
-    deployed_decoys.append(decoy)
+    with state_lock:
+        decoy, created = decoy_manager.deploy(target_ip, decoy_type, config, ttl)
+        decoy = dict(decoy)
     
     action_log = {
         'timestamp': datetime.now().isoformat(),
         'action': 'deploy_decoy',
         'decoy': decoy,
+        'redeploy': not created,
         'status': 'success'
     }
     
@@ -124,11 +670,34 @@ def deploy_decoy():
     
     return jsonify({
         'success': True,
-        'message': f'Decoy {decoy["id"]} deployed',
+        'message': f'Decoy {decoy["id"]} {"deployed" if created else "refreshed"}',
         'decoy': decoy,
         'action': action_log
     })
 
+@app.route('/decoys')
+def list_decoys():
+    """List live decoys, optionally filtered by target_ip and/or type"""
+    target_ip = request.args.get('target_ip')
+    decoy_type = request.args.get('type')
+    
+    with state_lock:
+        if target_ip and decoy_type:
+            decoy = decoy_manager.get(target_ip, decoy_type)
+            decoys = [decoy] if decoy else []
+        elif target_ip:
+            decoys = decoy_manager.for_ip(target_ip)
+        elif decoy_type:
+            decoys = decoy_manager.for_type(decoy_type)
+        else:
+            decoys = decoy_manager.all()
+        decoys = [dict(d) for d in decoys]
+    
+    return jsonify({
+        'decoys': decoys,
+        'count': len(decoys)
+    })
+
 @app.route('/action/alert', methods=['POST'])
 def alert():
     """Create a security alert"""
@@ -179,21 +748,113 @@ def log_event():
 
 @app.route('/state')
 def get_state():
-    """Get current orchestrator state"""
+    """Get current orchestrator state (supports ETag / If-None-Match)"""
+    # Expire decoys first, so the ETag covers what a snapshot would return
+    with state_lock:
+        decoy_manager.purge_expired()
+        etag = f"{STATE_EPOCH}-v{state_version}"
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    
+    snapshot = state_snapshot()
+    response = jsonify(snapshot)
+    response.set_etag(f"{STATE_EPOCH}-v{snapshot['version']}")
+    return response
+
+@app.route('/state/changes')
+def state_changes():
+    """
+    Get state mutations since ?since=<version>&epoch=<epoch>, or a full
+    snapshot if the client is too far behind or its epoch is not this run's
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify({'error': 'since version required'}), 400
+    epoch = request.args.get('epoch')
+    
+    with state_lock:
+        # Decoys expire lazily; purge so their removals show up as changes
+        decoy_manager.purge_expired()
+        version = state_version
+        oldest = change_log[0]['version'] if change_log else version + 1
+        if epoch == STATE_EPOCH and oldest - 1 <= since <= version:
+            # Versions in the log are contiguous, so slice instead of filtering
+            changes = list(islice(change_log, since - oldest + 1, None))
+            return jsonify({
+                'full': False,
+                'epoch': STATE_EPOCH,
+                'since': since,
+                'version': version,
+                'changes': changes,
+                'count': len(changes)
+            })
+    
+    # Client fell behind the change log, or its version is from another run
+    snapshot = state_snapshot()
+    return jsonify({
+        'full': True,
+        'epoch': STATE_EPOCH,
+        'since': since,
+        'version': snapshot['version'],
+        'state': snapshot
+    })
+
+@app.route('/enforcement/metrics')
+def enforcement_metrics():
+    """Per-backend enforcement batches, queue depth and latency"""
     return jsonify({
-        'blocked_ips': list(blocked_ips),
-        'rate_limited_ips': rate_limited_ips,
-        'deployed_decoys': deployed_decoys,
+        'backends': enforcement.get_metrics(),
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/actions/stream')
+def stream_actions():
+    """
+    Stream actions as Server-Sent Events (or NDJSON with ?format=ndjson).
+    
+    Resumes after ?cursor=<epoch>-<seq> or the Last-Event-ID header. This route holds
+    a server thread per client; use the stream server on STREAM_PORT for
+    large numbers of subscribers.
+    """
+    fmt = 'ndjson' if request.args.get('format') == 'ndjson' else 'sse'
+    raw_cursor = request.args.get('cursor', request.headers.get('Last-Event-ID'))
+    cursor = parse_stream_cursor(raw_cursor)
+    subscriber, gap = action_stream.subscribe(cursor)
+    
+    def generate():
+        try:
+            if gap:
+                yield format_stream_notice('gap', {'cursor': raw_cursor}, fmt)
+            while True:
+                with action_stream.condition:
+                    action_stream.condition.wait_for(
+                        lambda: subscriber.events or subscriber.dropped,
+                        timeout=STREAM_KEEPALIVE
+                    )
+                events = subscriber.drain()
+                if events:
+                    yield ''.join(format_stream_event(e, fmt) for e in events)
+                elif fmt == 'sse':
+                    yield ": keep-alive\n\n"
+                if subscriber.dropped:
+                    yield format_stream_notice('dropped', {'reason': 'client too slow'}, fmt)
+                    break
+        finally:
+            action_stream.unsubscribe(subscriber)
+    
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'text/event-stream'
+    return app.response_class(generate(), mimetype=mimetype, headers={'Cache-Control': 'no-cache'})
+
 @app.route('/actions/recent')
 def recent_actions():
     """Get recent actions from log"""
     try:
+        action_writer.flush()
         actions = []
-        if os.path.exists('data/actions.jsonl'):
-            with open('data/actions.jsonl', 'r') as f:
+        if os.path.exists(ACTION_LOG_FILE):
+            with open(ACTION_LOG_FILE, 'r') as f:
                 lines = f.readlines()
                 # Get last 50 actions
                 for line in lines[-50:]:
@@ -208,7 +869,9 @@ def recent_actions():
 
 if __name__ == '__main__':
     print("🎯 NeuroHoneypot Orchestrator Starting...")
-    print("📊 Logging actions to: data/actions.jsonl")
+    print(f"📊 Logging actions to: {ACTION_LOG_FILE} (durability: {ACTION_LOG_DURABILITY})")
     print("🌐 API available at: http://localhost:5001")
+    ActionStreamServer(action_stream).start()
+    print(f"📡 Action stream at: http://localhost:{STREAM_PORT}/actions/stream")
     app.run(host='0.0.0.0', port=5001, debug=False)
 
